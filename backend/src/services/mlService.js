@@ -3,6 +3,56 @@ const FormData = require('form-data');
 
 const ML_BASE_URL = process.env.ML_SERVICE_URL || 'http://localhost:8000';
 
+// Batch endpoints ka ?stream=true response (application/x-ndjson):
+// har result line aate hi onResult(entry), aakhri line summary
+// { success, count, failed } — wahi resolve hota hai
+const readNdjson = (stream, onResult) => new Promise((resolve, reject) => {
+  let buffered = '';
+  let summary  = null;
+  const handle = (line) => {
+    if (!line.trim()) return;
+    const entry = JSON.parse(line);
+    if (entry.index === undefined) summary = entry;
+    else onResult(entry);
+  };
+
+  stream.setEncoding('utf8');
+  stream.on('data', (chunk) => {
+    const lines = (buffered + chunk).split('\n');
+    buffered = lines.pop();
+    try {
+      lines.forEach(handle);
+    } catch (err) {
+      stream.destroy(err);
+    }
+  });
+  stream.on('end', () => {
+    try {
+      handle(buffered);
+    } catch (err) {
+      return reject(err);
+    }
+    if (!summary) return reject(new Error('ML stream ended without a summary line'));
+    if (!summary.success) return reject(new Error(summary.error));
+    resolve(summary);
+  });
+  stream.on('error', reject);
+});
+
+// Batch POST: onResult diya ho to streamed (results incrementally), warna poora JSON
+const postBatch = async (path, body, config, { onResult, order = 'input' } = {}) => {
+  if (!onResult) {
+    const response = await axios.post(`${ML_BASE_URL}${path}`, body, config);
+    return response.data;
+  }
+  const response = await axios.post(`${ML_BASE_URL}${path}`, body, {
+    ...config,
+    params      : { stream: true, order },
+    responseType: 'stream'
+  });
+  return readNdjson(response.data, onResult);
+};
+
 // Disease prediction (image buffer)
 const predictDisease = async (imageBuffer, mimeType) => {
   try {
@@ -27,6 +77,33 @@ const predictDisease = async (imageBuffer, mimeType) => {
   }
 };
 
+// Bulk disease prediction (many image buffers, one round trip)
+// options.onResult → per-image results stream hote hain (order: 'input' | 'completion')
+const predictDiseaseBatch = async (images, options) => {
+  try {
+    const form = new FormData();
+    images.forEach(({ buffer, mimeType, filename }, i) => {
+      form.append('files', buffer, {
+        filename   : filename || `crop_${i}.jpg`,
+        contentType: mimeType || 'image/jpeg'
+      });
+    });
+
+    return await postBatch(
+      '/predict/disease/batch',
+      form,
+      { headers: form.getHeaders(), timeout: 120000, maxBodyLength: Infinity },
+      options
+    );
+  } catch (err) {
+    console.error('ML predict/disease/batch error:', err.message);
+    if (err.code === 'ECONNREFUSED' || err.code === 'ENOTFOUND') {
+      throw new Error('ML service is starting up, please try again in 1-2 minutes');
+    }
+    throw new Error(`ML batch prediction failed: ${err.response?.data?.detail || err.message}`);
+  }
+};
+
 // 7-day risk forecast
 const predictForecast = async (ndviSeries, weather, districtId) => {
   try {
@@ -45,6 +122,24 @@ const predictForecast = async (ndviSeries, weather, districtId) => {
   }
 };
 
+// Bulk 7-day forecast — requests: [{ ndvi_series, weather, district_id }, ...]
+const predictForecastBatch = async (requests, options) => {
+  try {
+    return await postBatch(
+      '/predict/forecast/batch',
+      { requests },
+      { timeout: 120000, maxBodyLength: Infinity },
+      options
+    );
+  } catch (err) {
+    console.error('ML predict/forecast/batch error:', err.message);
+    if (err.code === 'ECONNREFUSED' || err.code === 'ENOTFOUND') {
+      throw new Error('ML service is starting up, please try again in 1-2 minutes');
+    }
+    throw new Error(`Batch forecast failed: ${err.response?.data?.detail || err.message}`);
+  }
+};
+
 // Full satellite pipeline
 const predictFull = async (bbox, lat, lon, districtId) => {
   try {
@@ -63,10 +158,31 @@ const predictFull = async (bbox, lat, lon, districtId) => {
   }
 };
 
+// Full pipeline for many bboxes — requests: [{ bbox, lat, lon, district_id }, ...]
+const predictFullBatch = async (requests, options) => {
+  try {
+    return await postBatch(
+      '/predict/full/batch',
+      { requests },
+      { timeout: 300000, maxBodyLength: Infinity },
+      options
+    );
+  } catch (err) {
+    console.error('ML predict/full/batch error:', err.message);
+    if (err.code === 'ECONNREFUSED' || err.code === 'ENOTFOUND') {
+      throw new Error('ML service is starting up, please try again in 1-2 minutes');
+    }
+    throw new Error(`Batch satellite pipeline failed: ${err.response?.data?.detail || err.message}`);
+  }
+};
+
 // Health check
 const checkMLHealth = async () => {
   const response = await axios.get(`${ML_BASE_URL}/health`, { timeout: 5000 });
   return response.data;
 };
 
-module.exports = { predictDisease, predictForecast, predictFull, checkMLHealth };
+module.exports = {
+  predictDisease, predictDiseaseBatch, predictForecast, predictForecastBatch,
+  predictFull, predictFullBatch, checkMLHealth
+};
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from executor import QueueFullError, INFERENCE_RETRY_AFTER
+from metrics import RollingStats
+
+# ── CONFIG ────────────────────────────────────────────────
+BATCH_MAX_SIZE    = int(os.getenv("BATCH_MAX_SIZE", 16))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", 10))
+BATCH_MAX_QUEUE   = int(os.getenv("BATCH_MAX_QUEUE", 256))     # queued items, upar → 503
+
+# ── MICRO-BATCHER ─────────────────────────────────────────
+class MicroBatcher:
+    """
+    Concurrent requests ko ek window (max_batch_size / max_wait_ms) tak
+    collect karke ek hi forward pass mein chalata hai.
+
+    run_batch : list of items → list of results (same order)
+    Pehla item aate hi window shuru hoti hai; batch full hone ya
+    deadline aane par dispatch. Worker thread pehle submit par start hota hai.
+    Saare forward passes isi ek thread par chalte hain — concurrent passes
+    ki OpenMP thread teams cores oversubscribe nahi karti. max_queue se
+    zyada items pending hon to submit QueueFullError deta hai.
+    """
+    def __init__(self, run_batch, max_batch_size: int = BATCH_MAX_SIZE,
+                 max_wait_ms: float = BATCH_MAX_WAIT_MS, max_queue: int = BATCH_MAX_QUEUE,
+                 retry_after: int = INFERENCE_RETRY_AFTER, name: str = "batcher"):
+        self.run_batch      = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait       = max(0.0, max_wait_ms) / 1000
+        self.max_queue      = max(1, int(max_queue))
+        self.retry_after    = retry_after
+        self.name           = name
+        self._rejected      = 0
+        self._queue         = queue.Queue()
+        self._thread        = None
+        self._lock          = threading.Lock()
+        self._batch_sizes   = Counter()
+        self._queue_wait_ms = RollingStats()
+        self._batch_ms      = RollingStats()
+
+    # ── LIFECYCLE ──
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name=self.name, daemon=True
+                )
+                self._thread.start()
+
+    # ── SUBMIT ──
+    def submit(self, item) -> Future:
+        return self.submit_many([item])[0]
+
+    def submit_many(self, items: list) -> list:
+        """Saare items ek saath queue mein, ya (jagah na ho to) koi nahi"""
+        self.start()
+        futures = [Future() for _ in items]
+        now     = time.perf_counter()
+        with self._lock:
+            if self._queue.qsize() + len(items) > self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(self.name, self.retry_after)
+            for item, future in zip(items, futures):
+                self._queue.put((item, future, now))
+        return futures
+
+    async def predict(self, item):
+        return await asyncio.wrap_future(self.submit(item))
+
+    async def predict_many(self, items: list) -> list:
+        """Event loop par wait — koi thread result ke liye block nahi hota"""
+        return await asyncio.gather(*(asyncio.wrap_future(f) for f in self.submit_many(items)))
+
+    # ── WORKER LOOP ──
+    def _collect(self) -> list:
+        batch    = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            # Cancelled waiters (client disconnect) ko skip karo
+            batch   = [entry for entry in self._collect()
+                       if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self._queue_wait_ms.observe((started - enqueued) * 1000)
+            with self._lock:
+                self._batch_sizes[len(batch)] += 1
+
+            try:
+                results = self.run_batch([item for item, _, _ in batch])
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            self._batch_ms.observe((time.perf_counter() - started) * 1000)
+
+    # ── STATS ──
+    def stats(self) -> dict:
+        with self._lock:
+            sizes    = dict(sorted(self._batch_sizes.items()))
+            rejected = self._rejected
+        batches = sum(sizes.values())
+        items   = sum(size * n for size, n in sizes.items())
+        return {
+            "max_batch_size"    : self.max_batch_size,
+            "max_wait_ms"       : self.max_wait * 1000,
+            "queued"            : self._queue.qsize(),
+            "max_queue"         : self.max_queue,
+            "rejected"          : rejected,
+            "batches"           : batches,
+            "items"             : items,
+            "avg_batch_size"    : round(items / batches, 2) if batches else None,
+            "batch_size_hist"   : sizes,
+            "queue_wait_ms"     : self._queue_wait_ms.summary(),
+            "batch_latency_ms"  : self._batch_ms.summary()
+        }
@@ -0,0 +1,146 @@
+"""
+Decode benchmark: full-resolution decode vs reduced-resolution decode.
+
+    python benchmarks/bench_decode.py                 # synthetic 12 MP + 48 MP images
+    python benchmarks/bench_decode.py leaf1.jpg ...   # apni sample images
+
+Har (image, mode) ek alag subprocess mein chalta hai taaki peak RSS
+(VmHWM) ek mode ka doosre mein leak na ho. Pehle non-RGB uploads (palette
+PNG, GIF, 1-bit PNG, 16-bit PNG) ka decode check hota hai — koi bhi fail ho
+ya baseline se bahut alag aaye to script fail hota hai.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+IMG_SIZE = 224
+
+def _synthetic(path: Path, width: int, height: int, fmt: str):
+    import numpy as np
+    from PIL import Image
+    # Smooth gradient + noise — real photo jaisa compress hota hai
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([x / width, y / height, (x + y) / (width + height)], axis=-1) * 200
+    rng  = np.random.default_rng(0)
+    arr  = (base + rng.normal(0, 12, base.shape)).clip(0, 255).astype(np.uint8)
+    Image.fromarray(arr).save(path, fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+
+def _mode_images(width: int = 1200, height: int = 900) -> dict:
+    """reduce() wale raaste (>= 448 px) par jaane wale non-RGB uploads"""
+    import io
+    import numpy as np
+    from PIL import Image
+    rng  = np.random.default_rng(0)
+    rgb  = Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+    gray = rng.integers(0, 65536, (height, width)).astype(np.uint16)
+    out  = {}
+    for name, img, fmt in [("P (png)",     rgb.convert("P"),      "PNG"),
+                           ("P (gif)",     rgb,                   "GIF"),
+                           ("1 (png)",     rgb.convert("1"),      "PNG"),
+                           ("I;16 (png)",  Image.fromarray(gray), "PNG"),
+                           ("I (tiff)",    Image.fromarray(gray.astype(np.int32)), "TIFF")]:
+        buf = io.BytesIO()
+        img.save(buf, fmt)
+        out[name] = buf.getvalue()
+    return out
+
+def _check_modes():
+    import io
+    import numpy as np
+    from PIL import Image
+    from imaging import load_pixels
+
+    print(f"{'upload':<14}{'decoded as':<12}{'mean |diff| vs baseline':>24}")
+    for name, data in _mode_images().items():
+        base = Image.open(io.BytesIO(data)).convert("RGB").resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR)
+        try:
+            pixels = load_pixels(data, IMG_SIZE)
+        except Exception as e:
+            raise SystemExit(f"{name}: load_pixels failed — {type(e).__name__}: {e}")
+        diff = np.abs(pixels.astype(np.int16) - np.asarray(base, dtype=np.int16)).mean()
+        if diff > 40:
+            raise SystemExit(f"{name}: decoded pixels differ from baseline (mean {diff:.1f})")
+        print(f"{name:<14}{Image.open(io.BytesIO(data)).mode:<12}{diff:>24.1f}")
+    print()
+
+def _peak_rss_mb() -> float:
+    # Linux: VmHWM exec par reset hota hai; ru_maxrss parent ka peak carry karta hai
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _run_child(mode: str, path: str, repeats: int) -> dict:
+    from PIL import Image
+    from imaging import decode_image
+    import io
+
+    data = Path(path).read_bytes()
+
+    def baseline():
+        img = Image.open(io.BytesIO(data)).convert("RGB")
+        return img.resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR)
+
+    def reduced():
+        img = decode_image(data, IMG_SIZE)
+        return img.resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR)
+
+    fn = baseline if mode == "baseline" else reduced
+    fn()                                           # warm-up
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return {
+        "decode_ms_p50": round(times[len(times) // 2], 1),
+        "decode_ms_min": round(times[0], 1),
+        "peak_rss_mb"  : round(_peak_rss_mb(), 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_run_child(*args.child, args.repeats)))
+        return
+
+    _check_modes()
+    images = args.images
+    if not images:
+        tmp = Path(tempfile.mkdtemp(prefix="bench_decode_"))
+        for name, (w, h), fmt in [("12mp.jpg", (4000, 3000), "JPEG"),
+                                  ("48mp.jpg", (8000, 6000), "JPEG"),
+                                  ("12mp.png", (4000, 3000), "PNG")]:
+            _synthetic(tmp / name, w, h, fmt)
+            images.append(str(tmp / name))
+
+    print(f"{'image':<14}{'mode':<10}{'p50 ms':>9}{'min ms':>9}{'peak RSS MB':>13}")
+    for path in images:
+        for mode in ("baseline", "reduced"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, path, "--repeats", str(args.repeats)],
+                capture_output=True, text=True, check=True
+            )
+            r = json.loads(out.stdout)
+            print(f"{os.path.basename(path):<14}{mode:<10}{r['decode_ms_p50']:>9}"
+                  f"{r['decode_ms_min']:>9}{r['peak_rss_mb']:>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Forecast benchmark: per-forecast latency vs batch size.
+
+    python benchmarks/bench_forecast.py --batch 1 8 64 512 2048
+
+Har batch size ke liye do tarike:
+    loop     — predict_forecast() har series par alag (jaise nightly run
+               har district ke liye /predict/forecast call karta tha)
+    batched  — predict_forecast_batch(): ek [B, 30, 5] tensor, ek forward pass
+Dono ke results same hone chahiye — mismatch par script fail hota hai.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from predictor import models, predict_forecast, predict_forecast_batch
+
+def sample_requests(n: int, seed: int = 0):
+    rng      = np.random.default_rng(seed)
+    series   = [rng.uniform(0.1, 0.9, 30).round(4).tolist() for _ in range(n)]
+    weathers = [{"temp": float(rng.uniform(15, 40)), "humidity": float(rng.uniform(20, 95)),
+                 "day_of_year": int(rng.integers(1, 366))} for _ in range(n)]
+    return series, weathers
+
+def best_ms(fn, repeats: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 8, 64, 512, 2048])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    models.get("lstm")
+    print(f"cores={os.cpu_count()}")
+    print(f"{'batch':>6}{'loop ms':>11}{'batched ms':>12}{'loop µs/item':>14}"
+          f"{'batched µs/item':>17}{'speedup':>9}")
+    for bs in args.batch:
+        series, weathers = sample_requests(bs)
+        looped  = lambda: [predict_forecast(s, w) for s, w in zip(series, weathers)]
+        batched = lambda: predict_forecast_batch(series, weathers)
+
+        a, b = looped(), batched()
+        for x, y in zip(a, b):
+            diff = max(abs(p["risk_score"] - q["risk_score"])
+                       for p, q in zip(x["forecast"], y["forecast"]))
+            if diff > 1e-3:
+                raise SystemExit(f"batch={bs}: batched forecast differs from single")
+
+        t_loop  = best_ms(looped, args.repeats)
+        t_batch = best_ms(batched, args.repeats)
+        print(f"{bs:>6}{t_loop:>11.2f}{t_batch:>12.2f}{t_loop * 1000 / bs:>14.1f}"
+              f"{t_batch * 1000 / bs:>17.1f}{t_loop / t_batch:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+/predict/full/batch benchmark — many bboxes, stub server par.
+
+    python benchmarks/bench_full_batch.py --items 50 --ndvi-ms 200 --weather-ms 100
+
+Do tarike (bench_http.py ka stub, artificial latency ke saath):
+    loop   — har bbox ke liye alag /predict/full (jaise state-wide refresh
+             script ek-ek district bhejta tha)
+    batch  — ek /predict/full/batch: NDVI + weather FULL_BATCH_CONCURRENCY
+             tak parallel, saare forecasts ek LSTM pass
+Har tarika alag coordinates use karta hai (weather cache warm na ho). Dono ke
+per-item results same hone chahiye — mismatch par script fail hota hai.
+Ek item jaan-boojh kar galat bbox ke saath bheja jaata hai: sirf wahi fail ho.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_http import StubHandler, start_stub
+
+def sample_items(n: int, lat0: float) -> list:
+    """Har item alag 0.1° weather cell mein"""
+    return [{"bbox": [73.0 + 0.2 * i, lat0, 73.1 + 0.2 * i, lat0 + 0.1],
+             "lat": lat0 + 0.05, "lon": 73.05 + 0.2 * i, "district_id": i}
+            for i in range(n)]
+
+async def run(args):
+    import httpx
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 timeout=300) as client:
+        await client.post("/predict/full", json=sample_items(1, 10.0)[0])      # warmup
+
+        loop_items = sample_items(args.items, 20.0)
+        t0 = time.perf_counter()
+        loop = [(await client.post("/predict/full", json=item)).json() for item in loop_items]
+        loop_ms = (time.perf_counter() - t0) * 1000
+
+        batch_items = sample_items(args.items, 30.0)                      # cold weather cells
+        batch_items.append({"bbox": [73.0, 20.0, 73.1], "lat": 20.0, "lon": 73.0})
+        t0 = time.perf_counter()
+        batch = (await client.post("/predict/full/batch",
+                                   json={"requests": batch_items})).json()
+        batch_ms = (time.perf_counter() - t0) * 1000
+    await main.async_http.aclose()
+
+    ok = batch["data"][:args.items]
+    if batch["failed"] != 1 or batch["data"][-1]["success"]:
+        raise SystemExit(f"expected only the bad bbox to fail: {batch['data'][-1]}")
+    for single, entry in zip(loop, ok):
+        a = [d["risk_score"] for d in single["forecast"]["forecast"]]
+        b = [d["risk_score"] for d in entry["data"]["forecast"]["forecast"]]
+        if single["ndvi_series"] != entry["data"]["ndvi_series"] or max(
+                abs(x - y) for x, y in zip(a, b)) > 1e-3:
+            raise SystemExit(f"mismatch at item {entry['index']}")
+
+    print(f"{args.items} bboxes (stub: NDVI {args.ndvi_ms:.0f} ms, weather "
+          f"{args.weather_ms:.0f} ms, concurrency {main.FULL_BATCH_CONCURRENCY})")
+    print(f"   loop  /predict/full        {loop_ms:8.0f} ms")
+    print(f"   batch /predict/full/batch  {batch_ms:8.0f} ms   ({loop_ms / batch_ms:.1f}×)")
+    print(f"   bad bbox → {batch['data'][-1]['error']}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--ndvi-ms", type=float, default=200)
+    parser.add_argument("--weather-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    base = start_stub()
+    os.environ.update(SENTINEL_BASE_URL=base, OPENWEATHER_BASE_URL=base,
+                      DISTRICT_SCHEDULER="0")
+    StubHandler.delays.update({"/api/v1/process": args.ndvi_ms / 1000,
+                               "/data/2.5/weather": args.weather_ms / 1000})
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
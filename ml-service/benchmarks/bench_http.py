@@ -0,0 +1,197 @@
+"""
+HTTP client layer ko local stub server ke against check + benchmark karta hai.
+
+    python benchmarks/bench_http.py --calls 200
+
+Stub server (ThreadingHTTPServer, HTTP/1.1 keep-alive) Sentinel auth /
+Process API / OpenWeather jaisa jawab deta hai. SENTINEL_BASE_URL aur
+OPENWEATHER_BASE_URL stub par point hote hain, phir:
+
+    behaviour  — 503 par jittered retry, hang par read timeout (sync aur
+                 async client), satellite.py ke fetch_* stub se data laate hain
+    latency    — bare requests.get (har call naya TCP connection) vs
+                 pooled http_client (keep-alive). Stub plain HTTP hai, to
+                 TLS handshake ka bachat (real APIs par bada hissa) isme nahi dikhta.
+    pipeline   — /predict/full ka fetch hissa: fetch_ndvi → fetch_weather
+                 (sequential) vs asyncio.gather(fetch_ndvi_async, fetch_weather_async),
+                 stub par --ndvi-ms / --weather-ms artificial latency ke saath
+"""
+import argparse
+import asyncio
+import datetime
+import io
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+def ndvi_tar() -> bytes:
+    """
+    Process API multi-temporal response jaisa tar: default.tif [64, 64, N]
+    float32 (har acquisition ek band) + userdata.json dates. NDVI har 5 din
+    par 0.70 → 0.55 girta hai; ek date poori cloudy (NaN) hai.
+    """
+    import tarfile
+    import tifffile
+
+    today  = datetime.date.today()
+    dates  = [today - datetime.timedelta(days=d) for d in range(40, -1, -5)]
+    values = np.linspace(0.70, 0.55, len(dates), dtype=np.float32)
+    stack  = np.repeat(values[None, None, :], 64, axis=0).repeat(64, axis=1)
+    stack[:, :, 3] = np.nan
+
+    tif = io.BytesIO()
+    tifffile.imwrite(tif, stack, photometric="minisblack", planarconfig="contig")
+    meta = json.dumps({"dates": [f"{d}T05:30:00Z" for d in dates]}).encode()
+    out  = io.BytesIO()
+    with tarfile.open(fileobj=out, mode="w") as tar:
+        for name, data in (("default.tif", tif.getvalue()), ("userdata.json", meta)):
+            info      = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return out.getvalue()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize         = 1 << 16                     # headers + body ek hi write (warna
+                                                   # keep-alive par delayed-ACK 40 ms stall)
+    failures         = {}                          # path → kitni baar 503 dena hai
+    delays           = {}                          # path → artificial latency (s)
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        path = self.path.split("?")[0]
+        if self.headers.get("Content-Length"):
+            self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(StubHandler.delays.get(path, 0))
+        if StubHandler.failures.get(path, 0) > 0:
+            StubHandler.failures[path] -= 1
+            return self._send(503, b"{}")
+        if path == "/hang":
+            time.sleep(5)
+            return self._send(200, b"{}")
+        if path.endswith("/token"):
+            return self._send(200, json.dumps({"access_token": "stub", "expires_in": 3600}).encode())
+        if path == "/api/v1/process":
+            return self._send(200, ndvi_tar(), "application/x-tar")
+        if path == "/data/2.5/weather":
+            return self._send(200, json.dumps({
+                "main": {"temp": 31.0, "humidity": 70}, "weather": [{"description": "stub"}]
+            }).encode())
+        return self._send(200, b"{}")
+
+    do_GET = do_POST = _route
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass                                       # /hang ka client timeout → broken pipe
+
+def start_stub() -> str:
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--ndvi-ms", type=float, default=400)
+    parser.add_argument("--weather-ms", type=float, default=150)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    base = start_stub()
+    os.environ.update(SENTINEL_BASE_URL=base, OPENWEATHER_BASE_URL=base,
+                      OPENWEATHER_TIMEOUT="1,1")
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    import requests
+    from http_client import http
+    from satellite import fetch_ndvi, fetch_weather
+
+    print("behaviour")
+    StubHandler.failures["/data/2.5/weather"] = 2
+    t0 = time.perf_counter()
+    r  = http.get("openweather", "/data/2.5/weather")
+    print(f"   2× 503 then 200   → status {r.status_code} "
+          f"after {len(r.raw.retries.history)} retries, {(time.perf_counter() - t0) * 1000:.0f} ms")
+    t0 = time.perf_counter()
+    try:
+        http.get("openweather", "/hang")
+        raise SystemExit("hang endpoint did not time out")
+    except requests.RequestException as e:              # retries khatam → ConnectionError
+        print(f"   hung endpoint     → {type(e).__name__} after {time.perf_counter() - t0:.2f} s (read=1 s)")
+    ndvi = fetch_ndvi([77.0, 28.0, 77.1, 28.1])
+    print(f"   fetch_ndvi        → {len(ndvi)} values, {ndvi[0]:.3f} → {ndvi[-1]:.3f}"
+          f" (stub 0.70 → 0.55 over 40 days)")
+    print(f"   fetch_weather     → {fetch_weather(28.0, 77.0)['description']}")
+
+    print("latency")
+    url = f"{base}/data/2.5/weather"
+    for name, call in (("bare requests.get", lambda: requests.get(url, timeout=5)),
+                       ("pooled http_client", lambda: http.get("openweather", "/data/2.5/weather"))):
+        call()
+        t0 = time.perf_counter()
+        for _ in range(args.calls):
+            call()
+        print(f"   {name:<20} {(time.perf_counter() - t0) * 1000 / args.calls:6.2f} ms/call")
+
+    asyncio.run(async_section(args, requests))
+
+async def async_section(args, requests):
+    import httpx
+    from http_client import async_http
+    from satellite import fetch_ndvi, fetch_ndvi_async, fetch_weather, fetch_weather_async
+
+    print("async behaviour")
+    StubHandler.failures["/data/2.5/weather"] = 2
+    r = await async_http.get("openweather", "/data/2.5/weather")
+    print(f"   2× 503 then 200   → status {r.status_code}")
+    t0 = time.perf_counter()
+    try:
+        await async_http.get("openweather", "/hang")
+        raise SystemExit("hang endpoint did not time out")
+    except httpx.TimeoutException as e:
+        print(f"   hung endpoint     → {type(e).__name__} after {time.perf_counter() - t0:.2f} s")
+
+    print(f"pipeline (stub: NDVI {args.ndvi_ms:.0f} ms, weather {args.weather_ms:.0f} ms)")
+    StubHandler.delays.update({"/api/v1/process": args.ndvi_ms / 1000,
+                               "/data/2.5/weather": args.weather_ms / 1000})
+    bbox  = [77.0, 28.0, 77.1, 28.1]
+    cells = iter(range(10**6))                     # har run naya weather cell — cache hit nahi
+
+    def sequential():
+        lat = 28.0 + 0.2 * next(cells)
+        return fetch_ndvi(bbox), fetch_weather(lat, 77.0)
+
+    async def concurrent():
+        lat = 28.0 + 0.2 * next(cells)
+        return await asyncio.gather(fetch_ndvi_async(bbox), fetch_weather_async(lat, 77.0))
+
+    for name, run in (("sequential (sync)", lambda: asyncio.to_thread(sequential)),
+                      ("asyncio.gather", concurrent)):
+        await run()
+        times = []
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            await run()
+            times.append((time.perf_counter() - t0) * 1000)
+        print(f"   {name:<20} {sorted(times)[len(times) // 2]:7.1f} ms")
+    await async_http.aclose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Preprocessing microbenchmark: torchvision transform vs BatchBuffer.
+
+    python benchmarks/bench_preprocess.py --batch 1 16 64
+
+baseline : Resize → ToTensor → Normalize per image, phir torch.stack
+buffer   : resize → uint8 HWC → preallocated buffer + fused addcmul normalize
+Dono decoded PIL images (decode_image ke baad) se shuru hote hain.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from PIL import Image
+from torchvision import transforms
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from imaging import MEAN, STD, BatchBuffer
+
+IMG_SIZE = 224
+
+def _timeit(fn, repeats: int) -> float:
+    fn()                                           # warm-up
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return sorted(times)[len(times) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--src-size", type=int, nargs=2, default=[500, 375],
+                        help="decoded image size (12 MP JPEG ka 1/8 draft ≈ 500×375)")
+    args = parser.parse_args()
+
+    rng    = np.random.default_rng(0)
+    w, h   = args.src_size
+    images = [Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+              for _ in range(max(args.batch))]
+
+    transform = transforms.Compose([
+        transforms.Resize((IMG_SIZE, IMG_SIZE)),
+        transforms.ToTensor(),
+        transforms.Normalize(mean=list(MEAN), std=list(STD))
+    ])
+    buffer = BatchBuffer(capacity=max(args.batch), size=IMG_SIZE)
+
+    def baseline(batch):
+        return torch.stack([transform(img) for img in batch])
+
+    def buffered(batch):
+        pixels = [np.array(img.resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR)) for img in batch]
+        return buffer.fill(pixels)
+
+    # Tensor stage akela (resize ke baad): ToTensor + Normalize + stack vs fill
+    to_tensor = transforms.Compose([transforms.ToTensor(),
+                                    transforms.Normalize(mean=list(MEAN), std=list(STD))])
+    resized   = [img.resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR) for img in images]
+    arrays    = [np.array(img) for img in resized]
+
+    stages = [
+        ("full", baseline, buffered, images),
+        ("tensor-only", lambda b: torch.stack([to_tensor(img) for img in b]),
+                        lambda b: buffer.fill(b), None)
+    ]
+    print(f"{'stage':<13}{'batch':>6}{'baseline ms':>14}{'buffer ms':>12}{'speedup':>9}{'max |diff|':>12}")
+    for name, old, new, inputs in stages:
+        for n in args.batch:
+            old_in = (inputs or resized)[:n]
+            new_in = (inputs or arrays)[:n]
+            diff   = (old(old_in) - new(new_in)).abs().max().item()
+            t_old  = _timeit(lambda: old(old_in), args.repeats)
+            t_new  = _timeit(lambda: new(new_in), args.repeats)
+            print(f"{name:<13}{n:>6}{t_old:>14.2f}{t_new:>12.2f}{t_old / t_new:>8.2f}x{diff:>12.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Forecast feature builder: purana per-row list builder vs SequenceBuffer.
+
+    python benchmarks/bench_sequences.py --batch 1 64 2048
+
+legacy  : predictor ka purana _build_sequence (per-row loop, insert(0, ...)
+          padding) + torch.tensor(...) — neeche reference ke taur par copy
+buffer  : sequences.SequenceBuffer.fill — vectorized, preallocated buffer
+
+Timing se pehle equivalence check chalta hai: edge cases (1/7/29/30/31/100
+din, missing weather keys, day_of_year wrap, float day_of_year) aur random
+batches par dono outputs bit-for-bit same hone chahiye, warna script fail.
+"""
+import argparse
+import datetime
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sequences import SequenceBuffer
+
+def legacy_sequence(ndvi_series: list, weather: dict) -> list:
+    day_of_year = weather.get(
+        "day_of_year",
+        datetime.datetime.now().timetuple().tm_yday
+    )
+    sequence = []
+    for i, ndvi in enumerate(ndvi_series[-30:]):
+        sequence.append([
+            float(ndvi),
+            (float(weather.get("temp", 28)) - 15) / 25,
+            float(weather.get("humidity", 0.6)) / 100,
+            float(weather.get("rainfall", 0)) / 50,
+            ((day_of_year + i) % 365) / 365
+        ])
+    while len(sequence) < 30:
+        sequence.insert(0, sequence[0])
+    return sequence
+
+def legacy(series: list, weathers: list) -> torch.Tensor:
+    return torch.tensor([legacy_sequence(s, w) for s, w in zip(series, weathers)],
+                        dtype=torch.float32)
+
+def edge_cases():
+    rng   = np.random.default_rng(1)
+    cases = []
+    for days in (1, 7, 29, 30, 31, 100):
+        series = rng.uniform(0, 1, days).tolist()
+        cases += [
+            (series, {"temp": 31.5, "humidity": 82, "rainfall": 12.5, "day_of_year": 120}),
+            (series, {"day_of_year": 350}),                     # wrap past 365
+            (series, {"temp": "27", "humidity": 55}),           # today's date, str temp
+            (series, {"temp": 18, "day_of_year": 364.5}),
+            ([int(v > 0.5) for v in series], {"day_of_year": 1}),
+        ]
+    return [c[0] for c in cases], [c[1] for c in cases]
+
+def random_batch(n: int, seed: int = 0):
+    rng      = np.random.default_rng(seed)
+    series   = [rng.uniform(0.1, 0.9, rng.integers(7, 45)).tolist() for _ in range(n)]
+    weathers = [{"temp": float(rng.uniform(15, 40)), "humidity": float(rng.uniform(20, 95)),
+                 "rainfall": float(rng.uniform(0, 40)), "day_of_year": int(rng.integers(1, 366))}
+                for _ in range(n)]
+    return series, weathers
+
+def check_equivalence(buffer: SequenceBuffer):
+    for name, (series, weathers) in (("edge cases", edge_cases()),
+                                     ("random 500", random_batch(500, seed=7))):
+        diff = (legacy(series, weathers) - buffer.fill(series, weathers)).abs().max().item()
+        print(f"   equivalence {name:<11} n={len(series):<4} max|diff|={diff:.1e}")
+        if diff != 0:
+            raise SystemExit(f"{name}: SequenceBuffer output differs from legacy builder")
+
+def _timeit(fn, repeats: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return sorted(times)[len(times) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 64, 2048])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    buffer = SequenceBuffer(capacity=max(args.batch))
+    check_equivalence(buffer)
+
+    print(f"{'batch':>6}{'legacy ms':>11}{'buffer ms':>11}{'speedup':>9}")
+    for bs in args.batch:
+        series, weathers = random_batch(bs)
+        t_old = _timeit(lambda: legacy(series, weathers), args.repeats)
+        t_new = _timeit(lambda: buffer.fill(series, weathers), args.repeats)
+        print(f"{bs:>6}{t_old:>11.3f}{t_new:>11.3f}{t_old / t_new:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
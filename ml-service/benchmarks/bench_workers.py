@@ -0,0 +1,133 @@
+"""
+Multi-worker benchmark: per-worker memory aur throughput, 1 → N workers.
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --mmap 0 1
+
+Har config ke liye `WEB_CONCURRENCY=N uvicorn main:app` start hota hai
+(WEIGHTS_MMAP=0/1; --workers nahi — production jaisa, workers env se N padhte hain), saare workers /ready hone tak wait,
+phir /predict/disease par concurrent load. Har request ki image unique hai
+(JPEG ke end par random bytes) taaki result cache hit na ho.
+
+Memory /proc/<pid>/smaps_rollup se:
+    RSS  — worker ke resident pages (shared pages bhi poore gine jaate hain)
+    PSS  — shared pages workers mein baant kar; asli per-worker cost yahi hai
+"""
+import argparse
+import io
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+from PIL import Image
+
+ML_DIR = Path(__file__).resolve().parent.parent
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def sample_images(n: int = 32) -> list:
+    rng, out = np.random.default_rng(0), []
+    for _ in range(n):
+        buf = io.BytesIO()
+        Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)).save(buf, "JPEG")
+        out.append(buf.getvalue())
+    return out
+
+def worker_pids(master: int) -> list:
+    pids = []
+    for task in Path(f"/proc/{master}/task").iterdir():
+        pids += [int(p) for p in (task / "children").read_text().split()]
+    # Workers spawn_main se start hote hain (resource_tracker nahi);
+    # 1 worker par master khud serve karta hai
+    return [p for p in pids if "spawn_main" in Path(f"/proc/{p}/cmdline").read_text()] \
+        or [master]
+
+def smaps(pid: int) -> dict:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        key, value = line.split(":")
+        fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+def wait_ready(url: str, workers: int, timeout: float = 300):
+    deadline, streak = time.time() + timeout, 0
+    while time.time() < deadline:
+        try:
+            ok = httpx.get(f"{url}/ready", timeout=5).status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        streak = streak + 1 if ok else 0
+        if streak >= 4 * workers:                  # har worker ne (probably) ready bola
+            return
+        time.sleep(0.25 if ok else 1)
+    raise SystemExit("Server did not become ready")
+
+def load_test(url: str, images: list, clients: int, seconds: float) -> float:
+    done, stop = [0], time.time() + seconds
+
+    def client(i: int):
+        with httpx.Client(timeout=60) as c:
+            while time.time() < stop:
+                data = images[i % len(images)] + os.urandom(8)
+                r = c.post(f"{url}/predict/disease", files={"file": ("leaf.jpg", data, "image/jpeg")})
+                if r.status_code == 200:
+                    done[0] += 1
+                i += clients
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return done[0] / seconds
+
+def run(workers: int, mmap: int, images: list, args) -> dict:
+    port = free_port()
+    env  = {**os.environ, "WEB_CONCURRENCY": str(workers), "WEIGHTS_MMAP": str(mmap)}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=ML_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(url, workers)
+        rps  = load_test(url, images, args.clients_per_worker * workers, args.seconds)
+        mems = [smaps(pid) for pid in worker_pids(proc.pid)]
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {
+        "rss" : sum(m["Rss"] for m in mems) / len(mems),
+        "pss" : sum(m["Pss"] for m in mems) / len(mems),
+        "total_pss": sum(m["Pss"] for m in mems),
+        "rps" : rps
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mmap", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--clients-per-worker", type=int, default=4)
+    args = parser.parse_args()
+
+    images = sample_images()
+    print(f"cores={os.cpu_count()}")
+    print(f"{'workers':>8}{'mmap':>6}{'RSS/worker MB':>15}{'PSS/worker MB':>15}"
+          f"{'total PSS MB':>14}{'req/s':>8}")
+    for mmap in args.mmap:
+        for n in args.workers:
+            r = run(n, mmap, images, args)
+            print(f"{n:>8}{mmap:>6}{r['rss']:>15.1f}{r['pss']:>15.1f}"
+                  f"{r['total_pss']:>14.1f}{r['rps']:>8.1f}")
+
+if __name__ == "__main__":
+    main()
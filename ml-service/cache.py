@@ -0,0 +1,224 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from sequences import SEQ_LEN, WEATHER_FEATURES
+
+# ── CONFIG ────────────────────────────────────────────────
+PREDICTION_CACHE_SIZE     = int(os.getenv("PREDICTION_CACHE_SIZE", 2048))
+PREDICTION_CACHE_TTL      = float(os.getenv("PREDICTION_CACHE_TTL", 24 * 3600))
+PREDICTION_CACHE_DIR      = os.getenv("PREDICTION_CACHE_DIR")          # unset → sirf memory
+PREDICTION_CACHE_DISK_MAX = int(os.getenv("PREDICTION_CACHE_DISK_MAX", 50000))
+
+# Forecast cache: dashboard same district ka series minutes mein dobara bhejta hai
+FORECAST_CACHE_SIZE       = int(os.getenv("FORECAST_CACHE_SIZE", 4096))
+FORECAST_CACHE_TTL        = float(os.getenv("FORECAST_CACHE_TTL", 15 * 60))
+FORECAST_NDVI_DECIMALS    = int(os.getenv("FORECAST_NDVI_DECIMALS", 3))
+FORECAST_WEATHER_DECIMALS = int(os.getenv("FORECAST_WEATHER_DECIMALS", 1))
+
+def content_key(data: bytes) -> str:
+    """Image bytes ka content hash (same photo → same key)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def forecast_key(ndvi_series: list, weather: dict,
+                 ndvi_decimals: int = FORECAST_NDVI_DECIMALS,
+                 weather_decimals: int = FORECAST_WEATHER_DECIMALS) -> str:
+    """
+    Forecast inputs ka canonical hash — sirf wahi jo LSTM dekhta hai:
+    last 30 NDVI values (ndvi_decimals tak rounded), weather features
+    (defaults ke saath, weather_decimals tak rounded) aur day_of_year.
+    Rounding ke andar ka farak same key deta hai.
+    """
+    day_of_year = weather.get("day_of_year", datetime.date.today().timetuple().tm_yday)
+    canonical   = [
+        [round(float(v), ndvi_decimals) + 0.0 for v in ndvi_series[-SEQ_LEN:]],
+        [round(float(weather.get(key, default)), weather_decimals) + 0.0
+         for key, default, _, _ in WEATHER_FEATURES],
+        round(float(day_of_year), 3)
+    ]
+    return hashlib.blake2b(json.dumps(canonical).encode(), digest_size=16).hexdigest()
+
+# ── RESULT CACHE ──────────────────────────────────────────
+class ResultCache:
+    """
+    LRU + TTL in-memory cache (max_entries tak bounded), optional disk tier.
+
+    Disk tier (disk_dir set ho to) har entry ko ek JSON file mein rakhta hai,
+    restart ke baad bhi hit deta hai; disk_max_entries se upar jaane par
+    sabse purani files delete hoti hain (background thread mein). namespace
+    key mein mix hota hai taaki model badalne par purane disk results hit na hon.
+    Async handlers aget() / aset() use karte hain — memory tier seedha, disk
+    I/O asyncio.to_thread mein, event loop par kabhi nahi.
+    """
+    def __init__(self, max_entries: int = PREDICTION_CACHE_SIZE,
+                 ttl_seconds: float = PREDICTION_CACHE_TTL,
+                 disk_dir: str = None, disk_max_entries: int = PREDICTION_CACHE_DISK_MAX,
+                 namespace: str = ""):
+        self.max_entries      = max(1, int(max_entries))
+        self.ttl              = ttl_seconds
+        self.namespace        = namespace
+        self.disk_max_entries = disk_max_entries
+        self._entries         = OrderedDict()       # key → (stored_at, value)
+        self._lock            = threading.Lock()
+        self._counters        = {"hits": 0, "disk_hits": 0, "misses": 0,
+                                 "evictions": 0, "expired": 0, "disk_evictions": 0}
+        self.disk_dir         = Path(disk_dir) / namespace if disk_dir else None
+        self._disk_count      = 0
+        self._pruning         = False
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_count = sum(1 for _ in self.disk_dir.glob("*/*.json"))
+
+    # ── MEMORY TIER ──
+    def get(self, key: str):
+        return self.get_with_age(key)[0]
+
+    def get_with_age(self, key: str) -> tuple:
+        """→ (value, age_seconds); miss / expired par (None, None)"""
+        now = time.time()
+        hit = self._memory_get(key, now)
+        return hit if hit is not None else self._disk_lookup(key, now)
+
+    def set(self, key: str, value):
+        now = time.time()
+        with self._lock:
+            self._put(key, value, now)
+        self._disk_set(key, value, now)
+
+    async def aget(self, key: str):
+        """get() event loop ke liye — disk tier thread mein padha jaata hai"""
+        now = time.time()
+        hit = self._memory_get(key, now)
+        if hit is not None:
+            return hit[0]
+        if self.disk_dir is None:
+            return self._disk_lookup(key, now)[0]
+        return (await asyncio.to_thread(self._disk_lookup, key, now))[0]
+
+    async def aset(self, key: str, value):
+        """set() event loop ke liye — disk write thread mein"""
+        now = time.time()
+        with self._lock:
+            self._put(key, value, now)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._disk_set, key, value, now)
+
+    def _memory_get(self, key: str, now: float):
+        """(value, age) ya None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if now - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return value, now - stored_at
+            del self._entries[key]
+            self._counters["expired"] += 1
+            return None
+
+    def _disk_lookup(self, key: str, now: float) -> tuple:
+        """Memory miss ke baad: disk tier (hit → memory mein promote)"""
+        value, stored_at = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self._counters["misses"] += 1
+                return None, None
+            self._counters["disk_hits"] += 1
+            self._put(key, value, stored_at)
+        return value, now - stored_at
+
+    def _put(self, key: str, value, stored_at: float):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # ── DISK TIER ──
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str, now: float) -> tuple:
+        """→ (value, stored_at), miss par (None, None)"""
+        if not self.disk_dir:
+            return None, None
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None, None
+        if now - record["stored_at"] > self.ttl:
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_count -= 1
+                self._counters["expired"] += 1
+            return None, None
+        return record["value"], record["stored_at"]
+
+    def _disk_set(self, key: str, value, now: float):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            is_new = not path.exists()
+            tmp    = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump({"stored_at": now, "value": value}, f)
+            os.replace(tmp, path)                    # atomic — half-written file kabhi nahi
+        except OSError as e:
+            print(f"Prediction cache disk write failed: {e}")
+            return
+        with self._lock:
+            self._disk_count += is_new
+            prune = self._disk_count > self.disk_max_entries and not self._pruning
+            self._pruning = self._pruning or prune
+        if prune:
+            # 50k files ka glob + stat — caller (request) ko nahi rokna
+            threading.Thread(target=self._disk_prune, name="cache-prune", daemon=True).start()
+
+    def _disk_prune(self):
+        """Sabse purani ~10% files hatao (mtime ke hisaab se)"""
+        try:
+            files = []
+            for path in self.disk_dir.glob("*/*.json"):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    pass                             # beech mein expire / replace hua
+            files.sort()
+            excess = max(0, len(files) - int(self.disk_max_entries * 0.9))
+            for _, path in files[:excess]:
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_count = len(files) - excess
+                self._counters["disk_evictions"] += excess
+        finally:
+            with self._lock:
+                self._pruning = False
+
+    # ── STATS ──
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            size     = len(self._entries)
+        lookups = counters["hits"] + counters["disk_hits"] + counters["misses"]
+        return {
+            "size"       : size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk_tier"  : str(self.disk_dir) if self.disk_dir else None,
+            "disk_size"  : self._disk_count if self.disk_dir else None,
+            **counters,
+            "hit_rate"   : round((counters["hits"] + counters["disk_hits"]) / lookups, 3)
+                           if lookups else None
+        }
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+import numpy as np
+from PIL import Image
+
+# ── CONFIG ────────────────────────────────────────────────
+PHASH_ENABLED      = os.getenv("PHASH_ENABLED", "0") == "1"
+PHASH_MAX_DISTANCE = int(os.getenv("PHASH_MAX_DISTANCE", 4))       # 64 mein se bits
+PHASH_INDEX_SIZE   = int(os.getenv("PHASH_INDEX_SIZE", 50000))
+PHASH_TTL          = float(os.getenv("PHASH_TTL", 24 * 3600))
+
+# 16-bit popcount lookup table — Hamming distance vectorized nikalne ke liye
+_POPCOUNT16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+# ── DIFFERENCE HASH ───────────────────────────────────────
+def dhash(pixels: np.ndarray) -> int:
+    """
+    uint8 RGB pixels (already downscaled decode) → 64-bit dHash.
+    9×8 grayscale thumbnail, har row mein adjacent pixels ka comparison.
+    """
+    gray = np.asarray(
+        Image.fromarray(pixels).convert("L").resize((9, 8), Image.BOX), dtype=np.int16
+    )
+    bits = (gray[:, 1:] > gray[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+# ── NEAR-DUPLICATE INDEX ──────────────────────────────────
+class NearDuplicateIndex:
+    """
+    Bounded ring buffer of (dHash, result). lookup() saare hashes se ek saath
+    XOR + popcount karke nearest neighbour nikalta hai — 50k entries par ~1 ms.
+    Capacity full hone par sabse purani entry overwrite hoti hai.
+    """
+    def __init__(self, capacity: int = PHASH_INDEX_SIZE,
+                 max_distance: int = PHASH_MAX_DISTANCE, ttl_seconds: float = PHASH_TTL):
+        self.capacity     = max(1, int(capacity))
+        self.max_distance = max_distance
+        self.ttl          = ttl_seconds
+        self._hashes      = np.zeros(self.capacity, dtype=np.uint64)
+        self._stored_at   = np.zeros(self.capacity, dtype=np.float64)
+        self._values      = [None] * self.capacity
+        self._next        = 0
+        self._size        = 0
+        self._lock        = threading.Lock()
+        self._lookups     = 0
+        self._hits        = 0
+
+    def lookup(self, h: int):
+        """Threshold ke andar sabse nazdeeki entry ka result, warna None"""
+        with self._lock:
+            self._lookups += 1
+            if not self._size:
+                return None
+            xor  = self._hashes[:self._size] ^ np.uint64(h)
+            dist = _POPCOUNT16[xor.view(np.uint16)].reshape(-1, 4).sum(axis=1, dtype=np.int32)
+            dist[self._stored_at[:self._size] < time.time() - self.ttl] = 65
+            idx  = int(np.argmin(dist))
+            if dist[idx] > self.max_distance:
+                return None
+            self._hits += 1
+            return self._values[idx]
+
+    def add(self, h: int, value):
+        with self._lock:
+            i = self._next
+            self._hashes[i]    = np.uint64(h)
+            self._stored_at[i] = time.time()
+            self._values[i]    = value
+            self._next         = (i + 1) % self.capacity
+            self._size         = min(self._size + 1, self.capacity)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size"            : self._size,
+                "capacity"        : self.capacity,
+                "max_distance"    : self.max_distance,
+                "lookups"         : self._lookups,
+                "inferences_saved": self._hits
+            }
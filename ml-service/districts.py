@@ -0,0 +1,30 @@
+import json
+import os
+
+# ── CONFIG ────────────────────────────────────────────────
+DISTRICTS_FILE = os.getenv("DISTRICTS_FILE")        # optional JSON list, same shape
+
+# Maharashtra sample districts (/districts/sample)
+SAMPLE_DISTRICTS = [
+    {"id":1,"name":"Nashik", "bbox":[73.6,19.9,74.2,20.4],"lat":20.0,"lon":73.8,"crop":"Wheat, Onion"},
+    {"id":2,"name":"Pune",   "bbox":[73.7,18.4,74.0,18.7],"lat":18.5,"lon":73.9,"crop":"Sugarcane"},
+    {"id":3,"name":"Nagpur", "bbox":[78.9,21.0,79.3,21.3],"lat":21.1,"lon":79.1,"crop":"Orange, Soybean"},
+    {"id":4,"name":"Solapur","bbox":[75.7,17.5,76.1,17.9],"lat":17.7,"lon":75.9,"crop":"Soybean, Jowar"},
+    {"id":5,"name":"Amravati","bbox":[77.6,20.8,77.9,21.1],"lat":20.9,"lon":77.8,"crop":"Cotton, Soybean"}
+]
+
+def load_districts() -> list:
+    """
+    Registered districts = SAMPLE_DISTRICTS + DISTRICTS_FILE (agar set hai).
+    File mein same id wala district sample ko override karta hai.
+    Har district: {"id", "name", "bbox", "lat", "lon", ...}
+    """
+    districts = {d["id"]: d for d in SAMPLE_DISTRICTS}
+    if DISTRICTS_FILE:
+        with open(DISTRICTS_FILE) as f:
+            for d in json.load(f):
+                missing = {"id", "bbox", "lat", "lon"} - d.keys()
+                if missing:
+                    raise ValueError(f"{DISTRICTS_FILE}: district {d} missing {sorted(missing)}")
+                districts[d["id"]] = d
+    return list(districts.values())
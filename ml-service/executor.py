@@ -0,0 +1,80 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# ── CONFIG ────────────────────────────────────────────────
+INFERENCE_CONCURRENCY = int(os.getenv("INFERENCE_CONCURRENCY", 16))
+INFERENCE_QUEUE_DEPTH = int(os.getenv("INFERENCE_QUEUE_DEPTH", 64))
+INFERENCE_RETRY_AFTER = int(os.getenv("INFERENCE_RETRY_AFTER", 2))
+
+class QueueFullError(Exception):
+    """Executor ki queue full hai — client ko Retry-After ke saath 503 do"""
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+# ── BOUNDED EXECUTOR ──────────────────────────────────────
+class BoundedExecutor:
+    """
+    Dedicated thread pool with admission control.
+    max_workers jobs ek saath chalte hain, max_queue tak wait karte hain;
+    usse zyada aane par submit() turant QueueFullError raise karta hai
+    (latency unbounded badhne ke bajaye).
+    """
+    def __init__(self, max_workers: int = INFERENCE_CONCURRENCY,
+                 max_queue: int = INFERENCE_QUEUE_DEPTH,
+                 retry_after: int = INFERENCE_RETRY_AFTER,
+                 name: str = "inference"):
+        self.name        = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue   = max(0, int(max_queue))
+        self.retry_after = retry_after
+        self._pool       = ThreadPoolExecutor(self.max_workers, thread_name_prefix=name)
+        self._slots      = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock       = threading.Lock()
+        self._in_flight  = 0
+        self._running    = 0
+        self._completed  = 0
+        self._rejected   = 0
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise QueueFullError(self.name, self.retry_after)
+        with self._lock:
+            self._in_flight += 1
+
+        def job():
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def release(_):
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._slots.release()
+
+        future = self._pool.submit(job)
+        future.add_done_callback(release)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue"  : self.max_queue,
+                "running"    : self._running,
+                "queued"     : self._in_flight - self._running,
+                "completed"  : self._completed,
+                "rejected"   : self._rejected
+            }
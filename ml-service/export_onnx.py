@@ -0,0 +1,100 @@
+"""
+ONNX export + parity/latency check for the CNN and LSTM.
+
+    pip install onnx onnxruntime
+    python export_onnx.py
+    INFERENCE_BACKEND=onnx uvicorn main:app ...
+
+Output:
+    models/cnn.onnx, models/lstm.onnx    dynamic batch axis, opset 17
+    models/onnx_report.json              per model: max abs diff (torch vs ORT)
+                                         aur side-by-side latency per batch size
+Parity tolerance se zyada diff aaye to script fail hota hai.
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ["INFERENCE_BACKEND"] = "torch"     # reference hamesha eager torch ho
+os.environ["USE_TORCHSCRIPT"]   = "0"
+os.environ["CNN_PRECISION"]     = "fp32"
+
+import torch
+
+from onnx_backend import OnnxModel
+from predictor import (CNN_ONNX_PATH, IMG_SIZE, LSTM_ONNX_PATH, MODEL_DIR,
+                       load_cnn_fp32, load_lstm_eager)
+
+PARITY_TOL = 1e-4
+
+def export(model, example, path, input_name: str, output_name: str):
+    torch.onnx.export(
+        model, example, str(path),
+        input_names   = [input_name],
+        output_names  = [output_name],
+        dynamic_axes  = {input_name: {0: "batch"}, output_name: {0: "batch"}},
+        opset_version = 17,
+        do_constant_folding = True
+    )
+    print(f"✅ {path} ({path.stat().st_size / 2**20:.1f} MB)")
+
+def median_ms(fn, x, repeats: int) -> float:
+    with torch.no_grad():
+        for _ in range(3):
+            fn(x)
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn(x)
+            times.append((time.perf_counter() - t0) * 1000)
+    return round(sorted(times)[len(times) // 2], 3)
+
+def compare(name: str, eager, session, make_input, batch_sizes, repeats: int) -> dict:
+    report = {"max_abs_diff": 0.0, "latency_ms": {}}
+    for bs in batch_sizes:
+        x = make_input(bs)
+        with torch.no_grad():
+            diff = (eager(x) - session(x)).abs().max().item()
+        report["max_abs_diff"] = max(report["max_abs_diff"], diff)
+        report["latency_ms"][f"batch_{bs}"] = {
+            "torch": median_ms(eager, x, repeats),
+            "onnx" : median_ms(session, x, repeats)
+        }
+        lat = report["latency_ms"][f"batch_{bs}"]
+        print(f"   batch={bs:<4} max|diff|={diff:.2e}  torch {lat['torch']:8.2f} ms"
+              f" | onnx {lat['onnx']:8.2f} ms")
+    if report["max_abs_diff"] > PARITY_TOL:
+        raise SystemExit(f"{name}: ONNX output differs from torch "
+                         f"({report['max_abs_diff']:.2e} > {PARITY_TOL})")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    def cnn_input(bs):
+        return torch.randn(bs, 3, IMG_SIZE, IMG_SIZE)
+
+    def lstm_input(bs):
+        return torch.rand(bs, 30, 5)
+
+    cnn  = load_cnn_fp32().cpu().to(memory_format=torch.contiguous_format)
+    lstm = load_lstm_eager().cpu()
+
+    export(cnn, cnn_input(1), CNN_ONNX_PATH, "image", "logits")
+    export(lstm, lstm_input(1), LSTM_ONNX_PATH, "sequence", "risk")
+
+    print("CNN  parity / latency")
+    cnn_report  = compare("CNN", cnn, OnnxModel(CNN_ONNX_PATH), cnn_input, (1, 16), args.repeats)
+    print("LSTM parity / latency")
+    lstm_report = compare("LSTM", lstm, OnnxModel(LSTM_ONNX_PATH), lstm_input, (1, 64, 512), args.repeats)
+
+    report = {"threads": torch.get_num_threads(), "cnn": cnn_report, "lstm": lstm_report}
+    with open(MODEL_DIR / "onnx_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ {MODEL_DIR / 'onnx_report.json'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Frozen TorchScript artifacts for the CNN and LSTM.
+
+    python export_torchscript.py
+
+Output (predictor inhe state dicts se pehle prefer karta hai,
+USE_TORCHSCRIPT=0 se band). torch.jit.freeze weights ko constants bana ke
+conv-bn fold karta hai. optimize_for_inference jaan-boojh kar nahi lagaya:
+mkldnn constants serialize nahi hote aur channels_last CNN par CPU latency
+badh jaati thi.
+    models/cnn_ts.pt     EfficientNet-B0 (channels_last agar CNN_CHANNELS_LAST=1)
+    models/lstm_ts.pt    CropRiskLSTM
+
+Har artifact save hone ke baad reload karke eager model se parity
+(max abs diff, alag batch sizes par), cold-load time aur per-call latency
+print hoti hai. Weights badalne par dobara chalayein — purana artifact
+(weights se older mtime) predictor ignore kar deta hai.
+"""
+import os
+import time
+
+os.environ["USE_TORCHSCRIPT"] = "0"           # reference hamesha eager ho
+os.environ["CNN_PRECISION"]   = "fp32"
+
+import torch
+
+from predictor import (CHANNELS_LAST, CNN_TS_PATH, IMG_SIZE, LSTM_TS_PATH,
+                       load_cnn_fp32, load_lstm_eager, load_torchscript)
+
+PARITY_TOL = 1e-4
+
+def export(model, example, path, name: str):
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+        frozen = torch.jit.freeze(traced.eval())
+    torch.jit.save(frozen, str(path))
+    print(f"✅ {name} → {path} ({path.stat().st_size / 2**20:.1f} MB)")
+
+def median_ms(fn, repeats: int = 20) -> float:
+    for _ in range(3):
+        fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return sorted(times)[len(times) // 2]
+
+def check(name: str, eager_loader, path, make_input, batch_sizes):
+    t0     = time.perf_counter()
+    eager  = eager_loader()
+    t_eag  = (time.perf_counter() - t0) * 1000
+    t0     = time.perf_counter()
+    script = load_torchscript(path)
+    t_ts   = (time.perf_counter() - t0) * 1000
+
+    with torch.no_grad():
+        for bs in batch_sizes:
+            x    = make_input(bs)
+            diff = (eager(x) - script(x)).abs().max().item()
+            flag = "ok" if diff <= PARITY_TOL else "MISMATCH"
+            print(f"   parity batch={bs:<3} max|diff|={diff:.2e} {flag}")
+            if diff > PARITY_TOL:
+                raise SystemExit(f"{name}: TorchScript output differs from eager")
+        x = make_input(1)
+        print(f"   cold load   eager {t_eag:7.1f} ms | torchscript {t_ts:7.1f} ms")
+        print(f"   call (bs=1) eager {median_ms(lambda: eager(x)):7.2f} ms | "
+              f"torchscript {median_ms(lambda: script(x)):7.2f} ms")
+
+def main():
+    memory_format = torch.channels_last if CHANNELS_LAST else torch.contiguous_format
+
+    def cnn_input(bs):
+        return torch.randn(bs, 3, IMG_SIZE, IMG_SIZE).contiguous(memory_format=memory_format)
+
+    def lstm_input(bs):
+        return torch.rand(bs, 30, 5)
+
+    cpu_cnn  = lambda: load_cnn_fp32().cpu()
+    cpu_lstm = lambda: load_lstm_eager().cpu()
+
+    export(cpu_cnn(), cnn_input(1), CNN_TS_PATH, "CNN")
+    check("CNN", cpu_cnn, CNN_TS_PATH, cnn_input, (1, 4))
+
+    export(cpu_lstm(), lstm_input(1), LSTM_TS_PATH, "LSTM")
+    check("LSTM", cpu_lstm, LSTM_TS_PATH, lstm_input, (1, 8, 64))
+
+if __name__ == "__main__":
+    main()
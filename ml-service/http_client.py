@@ -0,0 +1,200 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import RollingStats
+
+# ── CONFIG ────────────────────────────────────────────────
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 8))     # hosts ke pools
+HTTP_POOL_MAXSIZE     = int(os.getenv("HTTP_POOL_MAXSIZE", 32))        # per host keep-alive conns
+HTTP_MAX_RETRIES      = int(os.getenv("HTTP_MAX_RETRIES", 2))
+HTTP_READ_RETRIES     = int(os.getenv("HTTP_READ_RETRIES", 0))         # read timeout ke baad retry
+HTTP_BACKOFF_FACTOR   = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.3))
+HTTP_BACKOFF_MAX      = float(os.getenv("HTTP_BACKOFF_MAX", 5))
+RETRY_STATUSES        = (429, 500, 502, 503, 504)
+
+def _timeout(env: str, default: str) -> tuple:
+    """"connect,read" seconds → (connect, read)"""
+    connect, read = os.getenv(env, default).split(",")
+    return float(connect), float(read)
+
+# Endpoint → (base URL, (connect, read) timeout). Base URL env se badal
+# sakte hain — local stub server par test karne ke liye.
+ENDPOINTS = {
+    "sentinel_auth"   : (os.getenv("SENTINEL_BASE_URL", "https://services.sentinel-hub.com"),
+                         _timeout("SENTINEL_AUTH_TIMEOUT", "3,10")),
+    "sentinel_process": (os.getenv("SENTINEL_BASE_URL", "https://services.sentinel-hub.com"),
+                         _timeout("SENTINEL_PROCESS_TIMEOUT", "3,30")),
+    "openweather"     : (os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org"),
+                         _timeout("OPENWEATHER_TIMEOUT", "3,5")),
+}
+
+# ── RETRY POLICY ──────────────────────────────────────────
+def backoff_time(errors: int, factor: float = HTTP_BACKOFF_FACTOR) -> float:
+    """
+    Exponential backoff with jitter: n-th retry se pehle
+    base = factor · 2^(n-1) (HTTP_BACKOFF_MAX tak), sleep = base/2 + rand(0, base/2).
+    Jitter se ek saath fail hue workers ek saath retry nahi karte.
+    """
+    if errors == 0:
+        return 0
+    base = min(HTTP_BACKOFF_MAX, factor * 2 ** (errors - 1))
+    return base / 2 + random.uniform(0, base / 2)
+
+class JitteredRetry(Retry):
+    """
+    urllib3 Retry + backoff_time() — 1.x / 2.x dono par same (backoff_jitter
+    sirf 2.x mein). Server ka Retry-After bhi HTTP_BACKOFF_MAX tak hi maana
+    jaata hai — "Retry-After: 3600" wala 429 thread ko ghante bhar nahi rokta.
+    """
+    def get_backoff_time(self) -> float:
+        errors = sum(1 for h in self.history if h.redirect_location is None)
+        return backoff_time(errors, self.backoff_factor)
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_BACKOFF_MAX)
+
+def _build_session() -> requests.Session:
+    retry = JitteredRetry(
+        total                      = HTTP_MAX_RETRIES,
+        connect                    = HTTP_MAX_RETRIES,
+        read                       = HTTP_READ_RETRIES,
+        status                     = HTTP_MAX_RETRIES,
+        status_forcelist           = RETRY_STATUSES,
+        allowed_methods            = frozenset({"GET", "POST"}),   # dono APIs read-only hain
+        backoff_factor             = HTTP_BACKOFF_FACTOR,
+        respect_retry_after_header = True,
+        raise_on_status            = False                         # last response caller ko milega
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                          pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# ── SHARED CLIENTS ────────────────────────────────────────
+class _EndpointStats:
+    """Per-endpoint latency / error counters (sync aur async client dono)"""
+    def __init__(self, endpoints: dict):
+        self.endpoints = endpoints
+        self._latency  = {name: RollingStats() for name in endpoints}
+        self._errors   = {name: 0 for name in endpoints}
+        self._lock     = threading.Lock()
+
+    def _observe(self, endpoint: str, t0: float, failed: bool):
+        self._latency[endpoint].observe((time.perf_counter() - t0) * 1000)
+        if failed:
+            with self._lock:
+                self._errors[endpoint] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            errors = dict(self._errors)
+        return {
+            "pool_connections": HTTP_POOL_CONNECTIONS,
+            "pool_maxsize"    : HTTP_POOL_MAXSIZE,
+            "max_retries"     : HTTP_MAX_RETRIES,
+            "endpoints"       : {
+                name: {"base_url"  : base_url,
+                       "timeout_s" : list(timeout),
+                       "errors"    : errors[name],
+                       "latency_ms": self._latency[name].summary()}
+                for name, (base_url, timeout) in self.endpoints.items()
+            }
+        }
+
+class HttpClient(_EndpointStats):
+    """
+    Process-wide pooled requests.Session (keep-alive, retries) +
+    per-endpoint base URL / timeout + latency metrics.
+
+        http.post("sentinel_process", "/api/v1/process", json=...)
+    """
+    def __init__(self, endpoints: dict = ENDPOINTS):
+        super().__init__(endpoints)
+        self.session = _build_session()
+
+    def request(self, endpoint: str, method: str, path: str, **kwargs) -> requests.Response:
+        base_url, timeout = self.endpoints[endpoint]
+        kwargs.setdefault("timeout", timeout)
+        t0, failed = time.perf_counter(), True
+        try:
+            response = self.session.request(method, base_url + path, **kwargs)
+            failed   = False
+            return response
+        finally:
+            self._observe(endpoint, t0, failed)
+
+    def get(self, endpoint: str, path: str, **kwargs) -> requests.Response:
+        return self.request(endpoint, "GET", path, **kwargs)
+
+    def post(self, endpoint: str, path: str, **kwargs) -> requests.Response:
+        return self.request(endpoint, "POST", path, **kwargs)
+
+class AsyncHttpClient(_EndpointStats):
+    """
+    HttpClient ka async (httpx) jodidaar — same endpoints, timeouts, pool
+    sizes aur retry policy (connect errors / RETRY_STATUSES par backoff_time(),
+    read timeout par HTTP_READ_RETRIES tak, Retry-After HTTP_BACKOFF_MAX tak).
+    httpx.AsyncClient event loop se bandha hota hai, isliye pehle request par
+    banta hai; shutdown par aclose().
+    """
+    def __init__(self, endpoints: dict = ENDPOINTS):
+        super().__init__(endpoints)
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=httpx.Limits(
+                max_connections           = HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+                max_keepalive_connections = HTTP_POOL_MAXSIZE
+            ))
+        return self._client
+
+    async def request(self, endpoint: str, method: str, path: str, **kwargs) -> httpx.Response:
+        base_url, (connect, read) = self.endpoints[endpoint]
+        kwargs.setdefault("timeout", httpx.Timeout(read, connect=connect))
+        t0, failed = time.perf_counter(), True
+        retries, read_retries = HTTP_MAX_RETRIES, HTTP_READ_RETRIES
+        try:
+            for attempt in range(1, HTTP_MAX_RETRIES + 2):
+                try:
+                    response = await self.client.request(method, base_url + path, **kwargs)
+                    if response.status_code not in RETRY_STATUSES or retries == 0:
+                        failed = False
+                        return response
+                    retry_after = response.headers.get("Retry-After", "")
+                    delay       = min(float(retry_after), HTTP_BACKOFF_MAX) if retry_after.isdigit() else 0
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
+                    if retries == 0 or (isinstance(e, httpx.ReadTimeout) and read_retries == 0):
+                        raise
+                    read_retries -= isinstance(e, httpx.ReadTimeout)
+                    delay = 0
+                retries -= 1
+                await asyncio.sleep(max(delay, backoff_time(attempt)))
+        finally:
+            self._observe(endpoint, t0, failed)
+
+    async def get(self, endpoint: str, path: str, **kwargs) -> httpx.Response:
+        return await self.request(endpoint, "GET", path, **kwargs)
+
+    async def post(self, endpoint: str, path: str, **kwargs) -> httpx.Response:
+        return await self.request(endpoint, "POST", path, **kwargs)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+http       = HttpClient()
+async_http = AsyncHttpClient()
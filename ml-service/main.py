@@ -2,12 +2,45 @@ from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import HTMLResponse, JSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import List, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import os
+import threading
 import uvicorn
-from predictor import predict_disease, predict_forecast
-from satellite import fetch_ndvi, fetch_weather
+from predictor import (preprocess_image, predict_disease_batch, predict_forecast,
+                       predict_forecast_batch, models, CNN_FINGERPRINT, NUM_CLASSES)
+from satellite import (fetch_ndvi_async, fetch_weather_async, sentinel_token, ndvi_tiles,
+                       weather_stats)
+from http_client import http, async_http
+from batcher import MicroBatcher
+from executor import BoundedExecutor, QueueFullError
+from cache import (ResultCache, content_key, forecast_key, PREDICTION_CACHE_DIR,
+                   FORECAST_CACHE_SIZE, FORECAST_CACHE_TTL)
+from dedup import NearDuplicateIndex, dhash, PHASH_ENABLED
+from singleflight import AsyncSingleFlight
+from districts import SAMPLE_DISTRICTS, load_districts
+from scheduler import DistrictScheduler, DISTRICT_SCHEDULER
+from streaming import collect, ndjson_response
+
+# ── STARTUP: MODEL LOADING ────────────────────────────────
+# startup : server turant /health serve karta hai, models background mein
+#           load + warm-up hote hain; /ready tab tak 503 deta hai
+# lazy    : pehli request par load (tools / local dev ke liye)
+MODEL_LOAD_MODE = os.getenv("MODEL_LOAD_MODE", "startup")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MODEL_LOAD_MODE == "startup":
+        threading.Thread(target=models.load_all, name="model-loader", daemon=True).start()
+    if DISTRICT_SCHEDULER:
+        district_scheduler.start()
+    yield
+    await district_scheduler.stop()
+    await async_http.aclose()
 
 # ── CUSTOM OPENAPI METADATA ───────────────────────────────
 app = FastAPI(
@@ -29,9 +62,15 @@ app = FastAPI(
 
 ### 🔗 Available Endpoints
 - `/predict/disease` — Upload leaf image → get disease + confidence
+- `/predict/disease/batch` — Upload many leaf images in one request
 - `/predict/forecast` — NDVI time-series → 7-day risk forecast  
+- `/predict/forecast/batch` — Many districts/fields → forecasts in one LSTM pass
 - `/predict/full` — Full satellite pipeline (NDVI + weather + forecast)
+- `/predict/full/batch` — Full pipeline for many bboxes, one batched LSTM pass
 - `/districts/sample` — Maharashtra sample districts
+- `/districts/risk` · `/districts/{id}/risk` — Background-precomputed district risk
+- `/health` · `/ready` — Liveness · readiness (per-model load state)
+- `/metrics` — Inference batching stats (batch size, queue wait)
 
 ---
 *Built for Deep Learning Laboratory Capstone — 2025-26*
@@ -45,7 +84,8 @@ app = FastAPI(
         "name": "MIT License"
     },
     docs_url       = None,    # Custom docs banayenge
-    redoc_url      = "/redoc"
+    redoc_url      = "/redoc",
+    lifespan       = lifespan
 )
 
 # ── CUSTOM SWAGGER UI ─────────────────────────────────────
@@ -1577,21 +1617,124 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+# ── CNN MICRO-BATCHER ─────────────────────────────────────
+# Har CNN forward pass (single + batch uploads) isi ek thread par — concurrent
+# uploads ek hi forward pass mein jaate hain, aur passes overlap nahi karte
+disease_batcher = MicroBatcher(predict_disease_batch, name="cnn-batcher")
+
+# Batch uploads ke images parallel decode hote hain
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", 64))
+decode_pool     = ThreadPoolExecutor(
+    max_workers        = int(os.getenv("DECODE_WORKERS", min(8, os.cpu_count() or 1))),
+    thread_name_prefix = "decode"
+)
+
+# ── INFERENCE EXECUTOR ────────────────────────────────────
+# Decode + LSTM kabhi event loop par nahi chalte; queue full → 503 + Retry-After.
+# CNN result ka wait event loop par hota hai (executor thread block nahi).
+inference_pool = BoundedExecutor(name="inference")
+
+# ── PREDICTION CACHE ──────────────────────────────────────
+# Same photo dobara aaye (retry / re-upload) → decode + inference skip
+disease_cache = ResultCache(disk_dir=PREDICTION_CACHE_DIR, namespace=CNN_FINGERPRINT)
+
+# Optional: same leaf ki kuch seconds baad wali photo (near-duplicate) → cached result
+near_duplicates = NearDuplicateIndex() if PHASH_ENABLED else None
+
+# District alert par same (bbox, lat, lon) ke concurrent /predict/full → ek pipeline run
+full_pipeline_flight = AsyncSingleFlight("full-pipeline")
+
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request: Request, exc: QueueFullError):
+    return JSONResponse(
+        status_code = 503,
+        content     = {"detail": str(exc)},
+        headers     = {"Retry-After": str(exc.retry_after)}
+    )
+
+def _safe_decode(image_bytes: bytes):
+    try:
+        return preprocess_image(image_bytes)
+    except Exception as e:
+        return e
+
+def _prepare_many(images: list) -> list:
+    """
+    Executor par: decode (+ near-duplicate lookup). Har image ke liye
+    Exception, cached result dict, ya CNN ke liye (pixels, dhash | None)
+    """
+    decode  = map if len(images) == 1 else decode_pool.map
+    outputs = list(decode(_safe_decode, images))
+    for i, pixels in enumerate(outputs):
+        if isinstance(pixels, Exception):
+            continue
+        h      = dhash(pixels) if near_duplicates is not None else None
+        cached = near_duplicates.lookup(h) if h is not None else None
+        outputs[i] = cached if cached is not None else (pixels, h)
+    return outputs
+
+async def _content_keys(images: list) -> list:
+    """blake2b poore upload par — MBs ki images, isliye event loop se bahar"""
+    return await asyncio.to_thread(lambda: [content_key(b) for b in images])
+
+async def _infer_many(images: list) -> list:
+    """images: list of bytes → per-image result ya Exception, input order"""
+    outputs = await inference_pool.run(_prepare_many, images)
+    pending = [i for i, item in enumerate(outputs) if isinstance(item, tuple)]
+    if pending:
+        preds = await disease_batcher.predict_many([outputs[i][0] for i in pending])
+        for i, result in zip(pending, preds):
+            h, outputs[i] = outputs[i][1], result
+            if h is not None:
+                near_duplicates.add(h, result)
+    return outputs
+
+MAX_FORECAST_BATCH = int(os.getenv("MAX_FORECAST_BATCH", 10000))
+
+# /predict/full/batch: max items, aur ek saath kitne NDVI + weather fetch
+MAX_FULL_BATCH         = int(os.getenv("MAX_FULL_BATCH", 1000))
+FULL_BATCH_CONCURRENCY = int(os.getenv("FULL_BATCH_CONCURRENCY", 16))
+
+# ?stream=true: itne items ka ek inference call, phir unki lines flush
+STREAM_DISEASE_CHUNK   = int(os.getenv("STREAM_DISEASE_CHUNK", 8))
+STREAM_FORECAST_CHUNK  = int(os.getenv("STREAM_FORECAST_CHUNK", 256))
+
+# Same (rounded) NDVI series + weather → LSTM dobara nahi chalta
+forecast_cache = ResultCache(max_entries=FORECAST_CACHE_SIZE, ttl_seconds=FORECAST_CACHE_TTL)
+
 # ── REQUEST MODELS ────────────────────────────────────────
+class WeatherInput(BaseModel):
+    """LSTM weather features — numbers hi (warna 422); baaki keys (description ...) allowed"""
+    model_config = ConfigDict(extra="allow", allow_inf_nan=False)
+    temp        : Optional[float] = None
+    humidity    : Optional[float] = None
+    rainfall    : Optional[float] = None
+    day_of_year : Optional[float] = None
+
 class ForecastRequest(BaseModel):
     ndvi_series : List[float]
-    weather     : dict
+    weather     : WeatherInput
     district_id : Optional[int] = None
 
+    def weather_dict(self) -> dict:
+        """Missing / null features hata kar — predictor apne defaults lagata hai"""
+        return self.weather.model_dump(exclude_none=True)
+
+class ForecastBatchRequest(BaseModel):
+    requests    : List[ForecastRequest]
+
 class SatelliteRequest(BaseModel):
     bbox        : List[float]
     lat         : float
     lon         : float
     district_id : Optional[int] = None
 
+class FullBatchRequest(BaseModel):
+    requests    : List[SatelliteRequest]
+
 # ── ENDPOINTS ─────────────────────────────────────────────
 @app.get("/", tags=["Status"])
-def root():
+async def root():
     return {
         "service" : "KrishiSat AI — ML Service",
         "status"  : "running ✅",
@@ -1602,12 +1745,37 @@ def root():
         }
     }
 
-@app.get("/health", tags=["Status"])
-def health():
+@app.get("/health", tags=["Status"], summary="Liveness")
+async def health():
+    return {
+        "status" : "ok",
+        "models" : {name: s["state"] for name, s in models.status().items()},
+        "classes": NUM_CLASSES
+    }
+
+@app.get("/ready", tags=["Status"], summary="Readiness")
+async def ready():
+    return JSONResponse(
+        status_code = 200 if models.ready else 503,
+        content     = {"ready": models.ready, "models": models.status()}
+    )
+
+@app.get("/metrics", tags=["Status"])
+async def metrics():
+    pipeline = full_pipeline_flight.stats()
     return {
-        "status": "ok",
-        "models": ["CNN", "LSTM"],
-        "classes": 96
+        "cnn_batcher"   : disease_batcher.stats(),
+        "inference_pool": inference_pool.stats(),
+        "disease_cache" : disease_cache.stats(),
+        "forecast_cache": forecast_cache.stats(),
+        "sentinel_token": sentinel_token.stats(),
+        "http_client"   : http.stats(),
+        "async_http"    : async_http.stats(),
+        "ndvi_tiles"    : ndvi_tiles.stats(),
+        "weather_cache" : weather_stats(),
+        "full_pipeline" : {**pipeline, "duplicates_avoided": pipeline["coalesced"]},
+        "district_scheduler": district_scheduler.stats(),
+        "near_duplicate": near_duplicates.stats() if near_duplicates else {"enabled": False}
     }
 
 @app.post("/predict/disease",
@@ -1627,9 +1795,74 @@ async def disease_prediction(file: UploadFile = File(
     if not file.content_type.startswith("image/"):
         raise HTTPException(400, "Only image files accepted")
     image_bytes = await file.read()
-    result      = predict_disease(image_bytes)
+    key,        = await _content_keys([image_bytes])
+    result      = await disease_cache.aget(key)
+    if result is None:
+        result = (await _infer_many([image_bytes]))[0]
+        if isinstance(result, Exception):
+            raise result
+        await disease_cache.aset(key, result)
     return {"success": True, "data": result}
 
+@app.post("/predict/disease/batch",
+    tags=["Predictions"],
+    summary="Bulk Crop Disease Detection",
+    description="""
+Upload **many leaf/crop images** (one plot visit) in a single request.
+
+Images are decoded in parallel and run through the CNN as **one tensor batch**.
+Results come back in **input order**; a bad file only fails its own entry.
+
+`?stream=true` → `application/x-ndjson`: har image ka result ek line, jaise hi
+bane (`STREAM_DISEASE_CHUNK` images ka ek CNN batch); `order=completion` mein
+cache hits / bad files pehle. Aakhri line `{"success","count","failed"}` summary.
+    """
+)
+async def disease_batch_prediction(
+    files : List[UploadFile] = File(..., description="Leaf or crop images (JPG/PNG)"),
+    stream: bool = False,
+    order : Literal["input", "completion"] = "input"
+):
+    if not files:
+        raise HTTPException(400, "No files uploaded")
+    if len(files) > MAX_BATCH_FILES:
+        raise HTTPException(413, f"Maximum {MAX_BATCH_FILES} images per batch")
+
+    # Stream body response return hone ke baad chalta hai, tab tak UploadFile
+    # band ho chuke hote hain — bytes abhi padh lo
+    uploads = [(file.filename, await file.read()
+                if (file.content_type or "").startswith("image/") else None)
+               for file in files]
+    if stream:
+        return ndjson_response(_disease_entries(uploads, STREAM_DISEASE_CHUNK), order)
+    return await collect(_disease_entries(uploads, len(uploads)))
+
+async def _disease_entries(uploads: list, chunk: int):
+    """[(filename, image bytes | None), ...] → per-image entries, completion order"""
+    misses = []
+    keys   = iter(await _content_keys([b for _, b in uploads if b is not None]))
+    for idx, (filename, image_bytes) in enumerate(uploads):
+        entry = {"index": idx, "filename": filename}
+        if image_bytes is None:
+            yield {**entry, "success": False, "error": "Only image files accepted"}
+            continue
+        key         = next(keys)
+        cached      = await disease_cache.aget(key)
+        if cached is not None:
+            yield {**entry, "success": True, "data": cached}
+        else:
+            misses.append((entry, key, image_bytes))
+
+    for i in range(0, len(misses), chunk):
+        part  = misses[i:i + chunk]
+        fresh = await _infer_many([image for _, _, image in part])
+        for (entry, key, _), item in zip(part, fresh):
+            if isinstance(item, Exception):
+                yield {**entry, "success": False, "error": str(item) or type(item).__name__}
+            else:
+                await disease_cache.aset(key, item)
+                yield {**entry, "success": True, "data": item}
+
 @app.post("/predict/forecast",
     tags=["Predictions"],
     summary="7-Day Disease Risk Forecast",
@@ -1644,32 +1877,74 @@ Send **30 days of NDVI values + weather data** → Get 7-day disease risk foreca
 def risk_forecast(request: ForecastRequest):
     if len(request.ndvi_series) < 7:
         raise HTTPException(400, "Minimum 7 days NDVI required")
-    result = predict_forecast(request.ndvi_series, request.weather)
+    weather = request.weather_dict()
+    key     = forecast_key(request.ndvi_series, weather)
+    result = forecast_cache.get(key)
+    if result is None:
+        result = predict_forecast(request.ndvi_series, weather)
+        forecast_cache.set(key, result)
     return {"success": True, "district_id": request.district_id, "data": result}
 
-@app.post("/predict/full",
+@app.post("/predict/forecast/batch",
     tags=["Predictions"],
-    summary="Full Satellite Pipeline",
+    summary="Bulk 7-Day Risk Forecast",
     description="""
-**Complete automated pipeline:**
+Send **many** `ForecastRequest`s (districts / fields) → all forecasts from a
+**single `[B, 30, 5]` LSTM forward pass**.
 
-1. 📡 Fetch Sentinel-2 satellite imagery
-2. 🌿 Calculate NDVI values
-3. 🌤️ Get real-time weather data
-4. 🤖 Run LSTM risk forecast
+Results come back in **input order**; a request with fewer than 7 NDVI days
+fails only its own entry. Non-numeric weather features (`temp`, `humidity`,
+`rainfall`, `day_of_year`) → poora request **422**, stream shuru hone se pehle.
 
-Just provide the **bounding box coordinates** of the district.
+`?stream=true` → `application/x-ndjson`, `STREAM_FORECAST_CHUNK` forecasts ka
+ek LSTM pass, har pass ke baad uski lines (`order=input|completion`).
     """
 )
-def full_prediction(request: SatelliteRequest):
-    ndvi_series = fetch_ndvi(request.bbox)
-    weather     = fetch_weather(request.lat, request.lon)
-    forecast    = predict_forecast(ndvi_series, weather)
+async def risk_forecast_batch(
+    batch : ForecastBatchRequest,
+    stream: bool = False,
+    order : Literal["input", "completion"] = "input"
+):
+    items = batch.requests
+    if not items:
+        raise HTTPException(400, "No forecast requests")
+    if len(items) > MAX_FORECAST_BATCH:
+        raise HTTPException(413, f"Maximum {MAX_FORECAST_BATCH} forecasts per batch")
+    if stream:
+        return ndjson_response(_forecast_entries(items, STREAM_FORECAST_CHUNK), order)
+    return await collect(_forecast_entries(items, len(items)))
+
+async def _forecast_entries(items: List[ForecastRequest], chunk: int):
+    """Per-request entries, completion order; sirf cache miss LSTM batch mein"""
+    pending = []
+    for idx, item in enumerate(items):
+        entry = {"index": idx, "district_id": item.district_id}
+        if len(item.ndvi_series) < 7:
+            yield {**entry, "success": False, "error": "Minimum 7 days NDVI required"}
+            continue
+        weather = item.weather_dict()
+        key     = forecast_key(item.ndvi_series, weather)
+        cached  = await forecast_cache.aget(key)
+        if cached is not None:
+            yield {**entry, "success": True, "data": cached}
+        else:
+            pending.append((entry, key, item.ndvi_series, weather))
+
+    for i in range(0, len(pending), chunk):
+        part  = pending[i:i + chunk]
+        preds = await inference_pool.run(
+            predict_forecast_batch,
+            [series for _, _, series, _ in part],
+            [weather for _, _, _, weather in part]
+        )
+        for (entry, key, _, _), result in zip(part, preds):
+            await forecast_cache.aset(key, result)
+            yield {**entry, "success": True, "data": result}
+
+def _full_result(ndvi_series: list, weather: dict, forecast: dict) -> dict:
     current_ndvi= ndvi_series[-1]
     ndvi_trend  = "declining" if ndvi_series[-1] < ndvi_series[-7] else "stable"
     return {
-        "success"     : True,
-        "district_id" : request.district_id,
         "current_ndvi": round(current_ndvi, 3),
         "ndvi_trend"  : ndvi_trend,
         "ndvi_series" : ndvi_series,
@@ -1677,21 +1952,171 @@ def full_prediction(request: SatelliteRequest):
         "forecast"    : forecast
     }
 
+async def _fetch_inputs(bbox: list, lat: float, lon: float) -> tuple:
+    """NDVI series + weather, concurrently"""
+    return await asyncio.gather(fetch_ndvi_async(bbox), fetch_weather_async(lat, lon))
+
+async def _run_full_pipeline(bbox: list, lat: float, lon: float) -> dict:
+    ndvi_series, weather = await _fetch_inputs(bbox, lat, lon)
+    forecast = await inference_pool.run(predict_forecast, ndvi_series, weather)
+    return _full_result(ndvi_series, weather, forecast)
+
+async def _run_district(district: dict) -> dict:
+    """Scheduler ka pipeline — /predict/full wale single-flight se hi (duplicate run nahi)"""
+    bbox, lat, lon = district["bbox"], district["lat"], district["lon"]
+    return await full_pipeline_flight.do(
+        (tuple(bbox), lat, lon), lambda: _run_full_pipeline(bbox, lat, lon)
+    )
+
+# Registered districts ka risk background mein refresh → O(1) read endpoints
+district_scheduler = DistrictScheduler(_run_district, load_districts())
+
+@app.post("/predict/full",
+    tags=["Predictions"],
+    summary="Full Satellite Pipeline",
+    description="""
+**Complete automated pipeline:**
+
+1. 📡 Fetch Sentinel-2 satellite imagery
+2. 🌿 Calculate NDVI values
+3. 🌤️ Get real-time weather data
+4. 🤖 Run LSTM risk forecast
+
+Just provide the **bounding box coordinates** of the district.
+NDVI aur weather **concurrently** fetch hote hain (latency ≈ max, sum nahi).
+Same `(bbox, lat, lon)` ki concurrent requests ek hi pipeline run share karti hain.
+    """
+)
+async def full_prediction(request: SatelliteRequest):
+    key    = (tuple(request.bbox), request.lat, request.lon)
+    result = await full_pipeline_flight.do(
+        key, lambda: _run_full_pipeline(request.bbox, request.lat, request.lon)
+    )
+    return {"success": True, "district_id": request.district_id, **result}
+
+@app.post("/predict/full/batch",
+    tags=["Predictions"],
+    summary="Bulk Full Satellite Pipeline",
+    description="""
+Send **many** `SatelliteRequest`s (fields / districts — state-wide refresh)
+→ NDVI + weather har item ke liye **bounded parallelism** (`FULL_BATCH_CONCURRENCY`)
+se fetch, phir **saare forecasts ek batched LSTM pass** mein.
+
+Same `(bbox, lat, lon)` wale items ek hi baar fetch hote hain. Results
+**input order** mein; ek item ki galti (e.g. galat bbox) sirf usi entry ko fail karti hai.
+
+`?stream=true` → `application/x-ndjson`: jo fetches poore ho chuke unka ek LSTM
+pass, phir unki lines — slow bbox baaki results ko nahi rokta
+(`order=completion`; `order=input` mein pichle index ka wait).
+    """
+)
+async def full_prediction_batch(
+    batch : FullBatchRequest,
+    stream: bool = False,
+    order : Literal["input", "completion"] = "input"
+):
+    items = batch.requests
+    if not items:
+        raise HTTPException(400, "No satellite requests")
+    if len(items) > MAX_FULL_BATCH:
+        raise HTTPException(413, f"Maximum {MAX_FULL_BATCH} requests per batch")
+    if stream:
+        return ndjson_response(_full_entries(items, asyncio.FIRST_COMPLETED), order)
+    return await collect(_full_entries(items, asyncio.ALL_COMPLETED))
+
+async def _full_entries(items: List[SatelliteRequest], return_when: str):
+    """
+    Per-item entries, completion order. return_when:
+        ALL_COMPLETED   → saare fetch, phir ek LSTM pass (buffered response)
+        FIRST_COMPLETED → har round mein jitne fetch ho chuke unka LSTM pass
+    """
+    by_key = {}                                   # (bbox, lat, lon) → [index, ...]
+    for idx, item in enumerate(items):
+        if len(item.bbox) != 4:
+            yield {"index": idx, "district_id": item.district_id, "success": False,
+                   "error": "bbox must be [lon_min, lat_min, lon_max, lat_max]"}
+        else:
+            by_key.setdefault((tuple(item.bbox), item.lat, item.lon), []).append(idx)
+
+    limiter = asyncio.Semaphore(FULL_BATCH_CONCURRENCY)
+
+    async def fetch(key):
+        async with limiter:
+            try:
+                return key, await _fetch_inputs(list(key[0]), key[1], key[2])
+            except Exception as e:
+                return key, e
+
+    def entries(key, **fields):
+        for idx in by_key[key]:
+            yield {"index": idx, "district_id": items[idx].district_id, **fields}
+
+    pending = {asyncio.ensure_future(fetch(k)) for k in by_key}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            fetched = []
+            for key, inputs in (task.result() for task in done):
+                if isinstance(inputs, Exception):
+                    for entry in entries(key, success=False,
+                                         error=f"{type(inputs).__name__}: {inputs}"):
+                        yield entry
+                else:
+                    fetched.append((key, inputs))
+            if not fetched:
+                continue
+
+            forecasts = await inference_pool.run(
+                predict_forecast_batch,
+                [ndvi_series for _, (ndvi_series, _) in fetched],
+                [weather for _, (_, weather) in fetched]
+            )
+            for (key, inputs), forecast in zip(fetched, forecasts):
+                for entry in entries(key, success=True, data=_full_result(*inputs, forecast)):
+                    yield entry
+    finally:
+        for task in pending:                      # client disconnect → baaki fetch band
+            task.cancel()
+
 @app.get("/districts/sample",
     tags=["Districts"],
     summary="Maharashtra Sample Districts",
     description="Get sample Maharashtra districts with bounding box coordinates for testing."
 )
 def sample_districts():
+    return {"districts": SAMPLE_DISTRICTS}
+
+@app.get("/districts/risk",
+    tags=["Districts"],
+    summary="Precomputed Risk — All Districts",
+    description="""
+Har registered district (sample list + `DISTRICTS_FILE`) ka **background
+scheduler se precomputed** full-pipeline forecast — koi satellite / weather /
+LSTM call request par nahi hota.
+
+Har entry mein `computed_at`, `age_s` aur `stale` (age > `DISTRICT_STALE_MINUTES`).
+    """
+)
+async def districts_risk():
     return {
-        "districts": [
-            {"id":1,"name":"Nashik", "bbox":[73.6,19.9,74.2,20.4],"lat":20.0,"lon":73.8,"crop":"Wheat, Onion"},
-            {"id":2,"name":"Pune",   "bbox":[73.7,18.4,74.0,18.7],"lat":18.5,"lon":73.9,"crop":"Sugarcane"},
-            {"id":3,"name":"Nagpur", "bbox":[78.9,21.0,79.3,21.3],"lat":21.1,"lon":79.1,"crop":"Orange, Soybean"},
-            {"id":4,"name":"Solapur","bbox":[75.7,17.5,76.1,17.9],"lat":17.7,"lon":75.9,"crop":"Soybean, Jowar"},
-            {"id":5,"name":"Amravati","bbox":[77.6,20.8,77.9,21.1],"lat":20.9,"lon":77.8,"crop":"Cotton, Soybean"}
-        ]
+        "success"  : True,
+        "scheduler": district_scheduler.stats(),
+        "data"     : district_scheduler.all()
     }
 
+@app.get("/districts/{district_id}/risk",
+    tags=["Districts"],
+    summary="Precomputed Risk — One District",
+    description="Ek district ka latest precomputed forecast (O(1) lookup) + staleness metadata."
+)
+async def district_risk(district_id: int):
+    entry = district_scheduler.get(district_id)
+    if entry is None:
+        raise HTTPException(404, f"Unknown district {district_id}")
+    if not entry["ready"]:
+        return JSONResponse(status_code=503, headers={"Retry-After": "30"},
+                            content={"success": False, **entry})
+    return {"success": True, **entry}
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,39 @@
+import threading
+from collections import deque
+
+# ── ROLLING STATS ─────────────────────────────────────────
+class RollingStats:
+    """
+    Last `window` samples ka distribution rakhta hai (thread-safe).
+    summary() → count, mean, p50/p90/p99, max
+    """
+    def __init__(self, window: int = 2048):
+        self._samples = deque(maxlen=window)
+        self._count   = 0
+        self._lock    = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._samples.append(float(value))
+            self._count += 1
+
+    def summary(self, digits: int = 2) -> dict:
+        with self._lock:
+            samples = sorted(self._samples)
+            count   = self._count
+        if not samples:
+            return {"count": count, "mean": None, "p50": None,
+                    "p90": None, "p99": None, "max": None}
+
+        def pct(p: float) -> float:
+            idx = min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))
+            return round(samples[idx], digits)
+
+        return {
+            "count": count,
+            "mean" : round(sum(samples) / len(samples), digits),
+            "p50"  : pct(50),
+            "p90"  : pct(90),
+            "p99"  : pct(99),
+            "max"  : round(samples[-1], digits)
+        }
@@ -0,0 +1,72 @@
+import threading
+import time
+
+# ── MODEL MANAGER ─────────────────────────────────────────
+class ModelManager:
+    """
+    Models ka lifecycle: pending → loading → warming → ready (ya failed).
+
+    register() sirf loader/warmup yaad rakhta hai — import par kuch load nahi
+    hota. load_all() startup par (background thread mein) sab load + warm-up
+    karta hai; get() lazily load karta hai agar model abhi ready nahi hai,
+    aur concurrent callers ek hi load ka wait karte hain.
+    """
+    def __init__(self):
+        self._specs  = {}            # name → (loader, warmup, describe)
+        self._models = {}
+        self._status = {}
+        self._locks  = {}
+
+    def register(self, name: str, loader, warmup=None, describe=None):
+        self._specs[name]  = (loader, warmup, describe)
+        self._locks[name]  = threading.Lock()
+        self._status[name] = {"state": "pending", "artifact": None,
+                              "load_ms": None, "warmup_ms": None, "error": None}
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        return self._load(name)
+
+    def _load(self, name: str):
+        loader, warmup, describe = self._specs[name]
+        status = self._status[name]
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            try:
+                status.update(state="loading", error=None)
+                status["artifact"] = describe() if describe else None
+                t0    = time.perf_counter()
+                model = loader()
+                status["load_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+                if warmup:
+                    status["state"] = "warming"
+                    t0 = time.perf_counter()
+                    warmup(model)
+                    status["warmup_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+            except Exception as e:
+                status.update(state="failed", error=f"{type(e).__name__}: {e}")
+                raise
+
+            self._models[name] = model
+            status["state"]    = "ready"
+            print(f"✅ {name} ready ({status['artifact']}) — load {status['load_ms']} ms,"
+                  f" warm-up {status['warmup_ms']} ms")
+            return model
+
+    def load_all(self):
+        for name in self._specs:
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"❌ {name} failed to load: {e}")
+
+    @property
+    def ready(self) -> bool:
+        return all(s["state"] == "ready" for s in self._status.values())
+
+    def status(self) -> dict:
+        return {name: dict(s) for name, s in self._status.items()}
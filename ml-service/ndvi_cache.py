@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# ── CONFIG ────────────────────────────────────────────────
+NDVI_CACHE_DIR        = os.getenv("NDVI_CACHE_DIR")                    # unset → cache off
+NDVI_CACHE_MAX_MB     = float(os.getenv("NDVI_CACHE_MAX_MB", 512))
+NDVI_CACHE_RECHECK    = float(os.getenv("NDVI_CACHE_RECHECK_HOURS", 6)) * 3600
+NDVI_CACHE_LATE_DAYS  = int(os.getenv("NDVI_CACHE_LATE_DAYS", 2))      # late-processed scenes
+NDVI_CACHE_RETRY      = float(os.getenv("NDVI_CACHE_RETRY_MINUTES", 10)) * 60   # failed recheck
+
+# ── NDVI TILE CACHE ───────────────────────────────────────
+class NdviTileCache:
+    """
+    Per-acquisition NDVI rasters ka on-disk cache (memory-mapped .npy).
+
+    Scene key = hash(bbox, resolution, evalscript, cloud filter); har key ki
+    directory mein:
+        <YYYY-MM-DD>.npy   float32 [orbits, H, W] — us date ki acquisition(s)
+        index.json         kaunsa date range fetch ho chuka hai + kab check hua
+    plan() batata hai network se kya laana hai:
+        None         → window cache mein hai aur last check NDVI_CACHE_RECHECK
+                       se naya — zero network I/O
+        (from, to)   → recheck due: sirf last covered date (minus
+                       NDVI_CACHE_LATE_DAYS, der se process hue scenes ke
+                       liye) se aaj tak; window cache se bahar / evicted
+                       date → poora window
+    load() np.load(mmap_mode="r") se rasters deta hai — page cache se seedha,
+    koi copy nahi. Total size NDVI_CACHE_MAX_MB se upar jaaye to sabse kam
+    recently used date files hatti hain (mtime = last use); window ki koi
+    date evicted ho to agla plan() poora window dobara laata hai.
+    """
+    def __init__(self, root: str = NDVI_CACHE_DIR, max_mb: float = NDVI_CACHE_MAX_MB,
+                 recheck_seconds: float = NDVI_CACHE_RECHECK):
+        self.root      = Path(root) if root else None
+        self.max_bytes = int(max_mb * 2**20)
+        self.recheck   = recheck_seconds
+        self._lock     = threading.Lock()
+        self._counters = {"hits": 0, "partial_fetches": 0, "full_fetches": 0,
+                          "failed_rechecks": 0, "evicted_files": 0}
+        self._bytes    = 0
+        if self.root:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._bytes = sum(p.stat().st_size for p in self.root.glob("*/*.npy"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    @staticmethod
+    def scene_key(bbox: list, size: int, evalscript: str, max_cloud: float) -> str:
+        canonical = json.dumps([[round(float(v), 6) for v in bbox], size,
+                                hashlib.sha1(evalscript.encode()).hexdigest(), max_cloud])
+        return hashlib.blake2b(canonical.encode(), digest_size=10).hexdigest()
+
+    # ── INDEX ──
+    def _index(self, key: str) -> dict:
+        try:
+            with open(self.root / key / "index.json") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, key: str, index: dict):
+        path = self.root / key / "index.json"
+        tmp  = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+    # ── PLAN / LOAD / STORE ──
+    def plan(self, key: str, start: date, end: date):
+        """Network se laana hai to (from, to) date range, warna None"""
+        index = self._index(key)
+        if not index or start < date.fromisoformat(index["from"]) or any(
+            not (self.root / key / f"{d}.npy").exists()           # evicted
+            for d in index["dates"] if start <= date.fromisoformat(d) <= end
+        ):
+            self._count("full_fetches")
+            return start, end
+
+        if time.time() - index["checked_at"] < self.recheck:
+            self._count("hits")
+            return None
+        self._count("partial_fetches")
+        covered_to = date.fromisoformat(index["to"])
+        return max(start, min(covered_to, end) - timedelta(days=NDVI_CACHE_LATE_DAYS)), end
+
+    def store(self, key: str, fetched: tuple, dates: list, stack: np.ndarray):
+        """fetched (from, to) range ke rasters likho + index update"""
+        scene_dir = self.root / key
+        scene_dir.mkdir(exist_ok=True)
+        by_date = {}
+        for d, band in zip(dates, stack):
+            by_date.setdefault(d, []).append(band)
+
+        written = 0
+        for d, bands in by_date.items():
+            path = scene_dir / f"{d}.npy"
+            tmp  = scene_dir / f"{d}.{threading.get_ident()}.tmp.npy"
+            old  = path.stat().st_size if path.exists() else 0
+            np.save(tmp, np.stack(bands).astype(np.float32))
+            os.replace(tmp, path)
+            written += path.stat().st_size - old
+
+        index   = self._index(key)
+        fetched_from, fetched_to = fetched
+        if index and fetched_from > date.fromisoformat(index["from"]):
+            # Partial fetch: purane dates jo fetched range se pehle hain rakho
+            old_dates = [d for d in index["dates"] if date.fromisoformat(d) < fetched_from]
+            cov_from  = index["from"]
+        else:
+            old_dates, cov_from = [], fetched_from.isoformat()
+        self._write_index(key, {
+            "from"      : cov_from,
+            "to"        : fetched_to.isoformat(),
+            "checked_at": time.time(),
+            "dates"     : sorted(set(old_dates) | {d.isoformat() for d in by_date})
+        })
+
+        with self._lock:
+            self._bytes += written
+            prune = self._bytes > self.max_bytes
+        if prune:
+            self._prune(keep=key)
+
+    def defer(self, key: str, retry_seconds: float = NDVI_CACHE_RETRY):
+        """Recheck fail hua — cached rasters serve karo, retry_seconds baad dobara try"""
+        index = self._index(key)
+        if index:
+            index["checked_at"] = time.time() - self.recheck + retry_seconds
+            self._write_index(key, index)
+            self._count("failed_rechecks")
+
+    def load(self, key: str, start: date, end: date) -> list:
+        """[(date, float32 [orbits, H, W] memmap), ...] window ke andar"""
+        out = []
+        for d in self._index(key).get("dates", []):
+            day = date.fromisoformat(d)
+            if start <= day <= end:
+                path = self.root / key / f"{d}.npy"
+                try:
+                    out.append((day, np.load(path, mmap_mode="r")))
+                    os.utime(path)                   # LRU eviction ke liye "last used"
+                except FileNotFoundError:
+                    pass                             # dusre worker ne abhi evict kiya
+        return out
+
+    # ── EVICTION ──
+    def _prune(self, keep: str = None):
+        """
+        Sabse purane (least recently used) date files ~90% size tak hatao.
+        keep = abhi store hui scene — uske files load() se pehle nahi hatte.
+        """
+        files = []
+        for path in self.root.glob("*/*.npy"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue                          # dusre worker ne abhi hataya
+            files.append((st.st_mtime, st.st_size, path))
+        files.sort(key=lambda f: f[0])
+        total   = sum(size for _, size, _ in files)
+        target  = int(self.max_bytes * 0.9)
+        evicted = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            if path.parent.name == keep:
+                continue
+            total -= size
+            path.unlink(missing_ok=True)          # index mein date → agla plan() full fetch
+            evicted += 1
+        with self._lock:
+            self._bytes = total
+            self._counters["evicted_files"] += evicted
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    # ── STATS ──
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            counters = dict(self._counters)
+            size_mb  = round(self._bytes / 2**20, 2)
+        plans = counters["hits"] + counters["partial_fetches"] + counters["full_fetches"]
+        return {
+            "enabled"  : True,
+            "dir"      : str(self.root),
+            "size_mb"  : size_mb,
+            "max_mb"   : round(self.max_bytes / 2**20, 2),
+            **counters,
+            "hit_rate" : round(counters["hits"] / plans, 3) if plans else None
+        }
@@ -0,0 +1,33 @@
+import os
+import numpy as np
+import torch
+
+# ── CONFIG ────────────────────────────────────────────────
+ORT_THREADS = int(os.getenv("ORT_THREADS", 0))      # 0 → torch jitne threads
+
+# ── ONNX RUNTIME MODEL ────────────────────────────────────
+class OnnxModel:
+    """
+    ONNX Runtime CPU session jo torch module jaisa call hota hai:
+    torch.Tensor in → torch.Tensor out, taaki predict_* functions ka
+    output contract backend badalne par same rahe.
+    onnxruntime optional dependency hai — sirf INFERENCE_BACKEND=onnx par import.
+    """
+    def __init__(self, path, threads: int = None):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads     = threads or ORT_THREADS or torch.get_num_threads()
+        opts.inter_op_num_threads     = 1
+        self.session    = ort.InferenceSession(
+            str(path), opts, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x: torch.Tensor) -> torch.Tensor:
+        feed = np.ascontiguousarray(x.detach().cpu().numpy(), dtype=np.float32)
+        return torch.from_numpy(self.session.run(None, {self.input_name: feed})[0])
+
+    def eval(self):
+        return self
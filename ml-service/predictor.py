@@ -1,25 +1,86 @@
 import torch
 import torch.nn as nn
-from torchvision import models, transforms
-from PIL import Image
+from torchvision.models import efficientnet_b0
 import numpy as np
+import hashlib
 import json
+import os
 from pathlib import Path
-import io
+from imaging import load_pixels, thread_buffer
+from sequences import thread_sequence_buffer
+from onnx_backend import OnnxModel
+from model_manager import ModelManager
+from batcher import BATCH_MAX_SIZE
 
 # ── CONFIG ────────────────────────────────────────────────
 MODEL_DIR   = Path("./models")
 IMG_SIZE    = 224
 device      = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")  # torch | onnx
+
+# ── MULTI-WORKER ──────────────────────────────────────────
+# `WEB_CONCURRENCY=N uvicorn main:app` (bina --workers): uvicorn N workers
+# start karta hai aur har worker env se wahi N padhta hai. `--workers N`
+# mat do — uvicorn woh value workers ko export nahi karta, predictor 1 maan
+# leta. N workers mein har ek ko cores/N torch threads (oversubscription
+# nahi), aur weights torch.load(mmap=True) se file-backed pages mein — OS
+# page cache ek hi copy sab workers mein share karta hai.
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+WEIGHTS_MMAP    = os.getenv("WEIGHTS_MMAP", "1" if WEB_CONCURRENCY > 1 else "0") == "1"
+TORCH_THREADS   = int(os.getenv("TORCH_NUM_THREADS", max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)))
+torch.set_num_threads(TORCH_THREADS)
+
+# oneDNN convs NHWC par tez; lekin ONNX Runtime ko NCHW chahiye, aur
+# channels_last conversion mmap weights ki private copy bana deta hai
+CHANNELS_LAST = (os.getenv("CNN_CHANNELS_LAST", "1") == "1"
+                 and INFERENCE_BACKEND == "torch" and not WEIGHTS_MMAP)
+QUANT_ENGINE  = "x86" if "x86" in torch.backends.quantized.supported_engines else "qnnpack"
 
 # ── LOAD CLASS NAMES ──────────────────────────────────────
 with open(MODEL_DIR / "class_names.json") as f:
     CLASS_NAMES = json.load(f)
 NUM_CLASSES = len(CLASS_NAMES)
 
+# ── MODEL ARTIFACTS ───────────────────────────────────────
+CNN_WEIGHTS     = MODEL_DIR / "best_model.pth"
+LSTM_WEIGHTS    = MODEL_DIR / "lstm_model.pth"
+INT8_MODEL_PATH = MODEL_DIR / "best_model_int8.pt"            # quantize_cnn.py banata hai
+CNN_TS_PATH     = MODEL_DIR / "cnn_ts.pt"                     # export_torchscript.py banata hai
+LSTM_TS_PATH    = MODEL_DIR / "lstm_ts.pt"
+CNN_ONNX_PATH   = MODEL_DIR / "cnn.onnx"                      # export_onnx.py banata hai
+LSTM_ONNX_PATH  = MODEL_DIR / "lstm.onnx"
+CNN_PRECISION   = os.getenv("CNN_PRECISION", "fp32")          # fp32 | int8
+# jit.load mmap nahi karta — shared weights chahiye to eager state dict
+USE_TORCHSCRIPT = os.getenv("USE_TORCHSCRIPT", "0" if WEIGHTS_MMAP else "1") == "1"
+
+def _is_fresh(artifact: Path, source: Path) -> bool:
+    """Exported artifact tabhi use karo jab woh source weights se purana na ho"""
+    if not artifact.exists():
+        return False
+    return not source.exists() or artifact.stat().st_mtime >= source.stat().st_mtime
+
+def load_state_dict(model: nn.Module, path: Path) -> nn.Module:
+    """
+    WEIGHTS_MMAP: tensors file ke mmap se seedha parameters ban jaate hain
+    (assign=True, koi copy nahi) — sab workers same physical pages padhte hain.
+    """
+    if WEIGHTS_MMAP:
+        state = torch.load(str(path), map_location="cpu", weights_only=True, mmap=True)
+        model.load_state_dict(state, assign=True)
+    else:
+        model.load_state_dict(torch.load(path, map_location=device, weights_only=True))
+    return model
+
+def load_torchscript(path: Path):
+    """Frozen TorchScript artifact (conv-bn folded, Python dispatch ke bina)"""
+    model = torch.jit.load(str(path), map_location="cpu")
+    model.eval()
+    return model
+
 # ── CNN MODEL ─────────────────────────────────────────────
-def load_cnn():
-    model = models.efficientnet_b0(weights=None)
+def build_cnn() -> nn.Module:
+    """EfficientNet-B0 + custom classifier head (weights ke bina)"""
+    model = efficientnet_b0(weights=None)
     in_features = model.classifier[1].in_features
     model.classifier = nn.Sequential(
         nn.Dropout(p=0.4, inplace=True),
@@ -28,12 +89,47 @@ def load_cnn():
         nn.Dropout(p=0.3),
         nn.Linear(512, NUM_CLASSES)
     )
-    model.load_state_dict(
-        torch.load(MODEL_DIR / "best_model.pth", map_location=device, weights_only=True)
-    )
+    return model
+
+def load_cnn_fp32():
+    model = load_state_dict(build_cnn(), CNN_WEIGHTS)
     model.eval()
+    if CHANNELS_LAST:
+        model = model.to(memory_format=torch.channels_last)
     return model.to(device)
 
+def load_cnn_int8():
+    """Quantized TorchScript artifact — sirf CPU par chalta hai"""
+    torch.backends.quantized.engine = QUANT_ENGINE
+    return load_torchscript(INT8_MODEL_PATH)
+
+def cnn_artifact_path() -> Path:
+    """Jo CNN file actually load hogi: ONNX → int8 → TorchScript → eager state dict"""
+    if INFERENCE_BACKEND == "onnx" and _is_fresh(CNN_ONNX_PATH, CNN_WEIGHTS):
+        return CNN_ONNX_PATH
+    if CNN_PRECISION == "int8" and _is_fresh(INT8_MODEL_PATH, CNN_WEIGHTS):
+        return INT8_MODEL_PATH
+    if USE_TORCHSCRIPT and _is_fresh(CNN_TS_PATH, CNN_WEIGHTS):
+        return CNN_TS_PATH
+    return CNN_WEIGHTS
+
+# Exported artifacts (ONNX / int8 / TorchScript) CPU ke liye bane hain
+CNN_DEVICE = device if cnn_artifact_path() == CNN_WEIGHTS else torch.device("cpu")
+
+def load_cnn():
+    path = cnn_artifact_path()
+    if INFERENCE_BACKEND == "onnx" and path != CNN_ONNX_PATH:
+        print(f"⚠️ {CNN_ONNX_PATH} missing or stale — run export_onnx.py; using torch CNN")
+    if CNN_PRECISION == "int8" and path not in (INT8_MODEL_PATH, CNN_ONNX_PATH):
+        print(f"⚠️ {INT8_MODEL_PATH} missing or stale — run quantize_cnn.py; using fp32 CNN")
+    if path == CNN_ONNX_PATH:
+        return OnnxModel(CNN_ONNX_PATH)
+    if path == INT8_MODEL_PATH:
+        return load_cnn_int8()
+    if path == CNN_TS_PATH:
+        return load_torchscript(CNN_TS_PATH)
+    return load_cnn_fp32()
+
 # ── LSTM MODEL ────────────────────────────────────────────
 class CropRiskLSTM(nn.Module):
     def __init__(self):
@@ -59,30 +155,63 @@ class CropRiskLSTM(nn.Module):
         context      = (attn * out).sum(dim=1)
         return self.fc(context)
 
-def load_lstm():
-    model = CropRiskLSTM()
-    model.load_state_dict(
-        torch.load(MODEL_DIR / "lstm_model.pth", map_location=device, weights_only=True)
-    )
+def lstm_artifact_path() -> Path:
+    if INFERENCE_BACKEND == "onnx" and _is_fresh(LSTM_ONNX_PATH, LSTM_WEIGHTS):
+        return LSTM_ONNX_PATH
+    if USE_TORCHSCRIPT and _is_fresh(LSTM_TS_PATH, LSTM_WEIGHTS):
+        return LSTM_TS_PATH
+    return LSTM_WEIGHTS
+
+LSTM_DEVICE = device if lstm_artifact_path() == LSTM_WEIGHTS else torch.device("cpu")
+
+def load_lstm_eager():
+    model = load_state_dict(CropRiskLSTM(), LSTM_WEIGHTS)
     model.eval()
     return model.to(device)
 
-# ── LOAD BOTH MODELS AT STARTUP ───────────────────────────
-print("Loading models...")
-cnn_model  = load_cnn()
-lstm_model = load_lstm()
-print(f"✅ CNN  loaded → {NUM_CLASSES} classes")
-print(f"✅ LSTM loaded → 7-day forecaster")
-
-# ── IMAGE TRANSFORM ───────────────────────────────────────
-transform = transforms.Compose([
-    transforms.Resize((IMG_SIZE, IMG_SIZE)),
-    transforms.ToTensor(),
-    transforms.Normalize(
-        mean=[0.485, 0.456, 0.406],
-        std=[0.229, 0.224, 0.225]
-    )
-])
+def load_lstm():
+    path = lstm_artifact_path()
+    if INFERENCE_BACKEND == "onnx" and path != LSTM_ONNX_PATH:
+        print(f"⚠️ {LSTM_ONNX_PATH} missing or stale — run export_onnx.py; using torch LSTM")
+    if path == LSTM_ONNX_PATH:
+        return OnnxModel(LSTM_ONNX_PATH)
+    if path == LSTM_TS_PATH:
+        return load_torchscript(LSTM_TS_PATH)
+    return load_lstm_eager()
+
+# ── MODEL LIFECYCLE ───────────────────────────────────────
+# Import par kuch load nahi hota — main.py startup par load_all() chalata hai,
+# warna pehla predict call lazily load karta hai.
+WARMUP_BATCH_SIZES = [int(b) for b in os.getenv("WARMUP_BATCH_SIZES", "1,8").split(",") if b]
+
+def warmup_cnn(model):
+    """Dummy forward passes — oneDNN kernels / JIT profiling pehle hi prime ho jaayein"""
+    with torch.no_grad():
+        for bs in WARMUP_BATCH_SIZES:
+            x = torch.zeros(bs, 3, IMG_SIZE, IMG_SIZE, device=CNN_DEVICE)
+            if CHANNELS_LAST:
+                x = x.contiguous(memory_format=torch.channels_last)
+            for _ in range(2):
+                model(x)
+
+def warmup_lstm(model):
+    with torch.no_grad():
+        for bs in WARMUP_BATCH_SIZES:
+            for _ in range(2):
+                model(torch.zeros(bs, 30, 5, device=LSTM_DEVICE))
+
+models = ModelManager()
+models.register("cnn",  load_cnn,  warmup_cnn,  lambda: cnn_artifact_path().name)
+models.register("lstm", load_lstm, warmup_lstm, lambda: lstm_artifact_path().name)
+
+def model_fingerprint(path: Path) -> str:
+    """Weights file ka chhota fingerprint (size + mtime) — result cache namespace"""
+    stat = path.stat()
+    return hashlib.blake2b(
+        f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode(), digest_size=6
+    ).hexdigest()
+
+CNN_FINGERPRINT = model_fingerprint(cnn_artifact_path())
 
 # ── RISK LEVEL HELPER ─────────────────────────────────────
 def get_risk_level(score: float) -> str:
@@ -107,29 +236,24 @@ def get_recommendation(disease: str, risk: str) -> str:
     return recs["default"]
 
 # ── PREDICT DISEASE FROM IMAGE ────────────────────────────
-def predict_disease(image_bytes: bytes) -> dict:
-    img    = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    tensor = transform(img).unsqueeze(0).to(device)
-    
-    with torch.no_grad():
-        output = cnn_model(tensor)
-        probs  = torch.softmax(output, dim=1)
-        top5   = torch.topk(probs, 5)
-    
+def preprocess_image(image_bytes: bytes) -> np.ndarray:
+    """Image bytes → uint8 [224, 224, 3] pixels; normalize batch buffer mein hota hai"""
+    return load_pixels(image_bytes, IMG_SIZE)
+
+def _disease_result(values, indices) -> dict:
+    """Ek image ke top-5 (probs, class idx) → response dict"""
     top5_results = []
-    for i in range(5):
-        idx  = top5.indices[0][i].item()
-        conf = top5.values[0][i].item() * 100
+    for conf, idx in zip(values.tolist(), indices.tolist()):
         top5_results.append({
             "disease"   : CLASS_NAMES[idx],
-            "confidence": round(conf, 2)
+            "confidence": round(conf * 100, 2)
         })
-    
+
     top_disease = top5_results[0]["disease"]
     top_conf    = top5_results[0]["confidence"]
     risk_score  = top_conf / 100 if "healthy" not in top_disease.lower() else 0.05
     risk_level  = get_risk_level(risk_score)
-    
+
     return {
         "disease"       : top_disease,
         "confidence"    : top_conf,
@@ -139,38 +263,39 @@ def predict_disease(image_bytes: bytes) -> dict:
         "top5"          : top5_results
     }
 
-# ── PREDICT 7-DAY RISK FROM NDVI SERIES ──────────────────
-def predict_forecast(ndvi_series: list, weather: dict) -> dict:
+def predict_disease_batch(images: list) -> list:
     """
-    ndvi_series : list of 30 floats (daily NDVI)
-    weather     : {"temp": float, "humidity": float,
-                   "rainfall": float, "day_of_year": int}
+    preprocess_image() ke uint8 pixels → thread ke reusable buffer mein
+    normalize → CNN forward pass (BATCH_MAX_SIZE ke chunks mein, buffer usse
+    bada nahi hota) → per-image results (input order mein)
     """
-    import datetime
-    day_of_year = weather.get(
-        "day_of_year",
-        datetime.datetime.now().timetuple().tm_yday
-    )
-    
-    sequence = []
-    for i, ndvi in enumerate(ndvi_series[-30:]):   # Last 30 days
-        sequence.append([
-            float(ndvi),
-            (float(weather.get("temp", 28)) - 15) / 25,
-            float(weather.get("humidity", 0.6)) / 100,
-            float(weather.get("rainfall", 0)) / 50,
-            ((day_of_year + i) % 365) / 365
-        ])
-    
-    # Pad if less than 30 days
-    while len(sequence) < 30:
-        sequence.insert(0, sequence[0])
-    
-    tensor = torch.FloatTensor([sequence]).to(device)
-    
+    buffer  = thread_buffer(capacity=BATCH_MAX_SIZE, size=IMG_SIZE,
+                            channels_last=CHANNELS_LAST, device=CNN_DEVICE)
+    model   = models.get("cnn")
+    results = []
     with torch.no_grad():
-        risk_scores = lstm_model(tensor)[0].cpu().numpy()
-    
+        for i in range(0, len(images), BATCH_MAX_SIZE):
+            batch  = buffer.fill(images[i:i + BATCH_MAX_SIZE])
+            probs  = torch.softmax(model(batch), dim=1)
+            top5   = torch.topk(probs, 5)
+            values, indices = top5.values.cpu(), top5.indices.cpu()
+            results.extend(_disease_result(values[j], indices[j]) for j in range(len(batch)))
+    return results
+
+def predict_disease(image_bytes: bytes) -> dict:
+    return predict_disease_batch([preprocess_image(image_bytes)])[0]
+
+# ── PREDICT 7-DAY RISK FROM NDVI SERIES ──────────────────
+FORECAST_CHUNK = int(os.getenv("FORECAST_CHUNK", 2048))    # ek forward pass mein max series
+
+# Risk level ke hisaab se specific recommendation
+RISK_RECOMMENDATIONS = {
+    "HIGH"  : "⚠️ High disease risk detected! Apply preventive fungicide (Mancozeb 75% WP @ 2g/L) immediately. Avoid irrigation for 2-3 days. Monitor daily.",
+    "MEDIUM": "⚡ Moderate risk — Scout fields every 2 days. Keep drainage clear. Consider preventive spray if humidity stays above 75%.",
+    "LOW"   : "✅ Low disease risk. Continue regular monitoring. Maintain proper plant spacing for air circulation."
+}
+
+def _forecast_result(risk_scores) -> dict:
     forecast = []
     for day_idx, score in enumerate(risk_scores):
         forecast.append({
@@ -183,17 +308,34 @@ def predict_forecast(ndvi_series: list, weather: dict) -> dict:
     peak_day   = max(forecast, key=lambda x: x["risk_score"])["day"]
     risk_level = get_risk_level(max_risk)
 
-    # Risk level ke hisaab se specific recommendation
-    risk_recommendations = {
-        "HIGH"  : "⚠️ High disease risk detected! Apply preventive fungicide (Mancozeb 75% WP @ 2g/L) immediately. Avoid irrigation for 2-3 days. Monitor daily.",
-        "MEDIUM": "⚡ Moderate risk — Scout fields every 2 days. Keep drainage clear. Consider preventive spray if humidity stays above 75%.",
-        "LOW"   : "✅ Low disease risk. Continue regular monitoring. Maintain proper plant spacing for air circulation."
-    }
-
     return {
         "forecast"       : forecast,
         "max_risk_score" : round(max_risk, 3),
         "max_risk_level" : risk_level,
         "peak_risk_day"  : peak_day,
-        "recommendation" : risk_recommendations[risk_level]
+        "recommendation" : RISK_RECOMMENDATIONS[risk_level]
     }
+
+def predict_forecast_batch(ndvi_series_list: list, weathers: list) -> list:
+    """
+    Many (ndvi_series, weather) pairs → ek [B, 30, 5] tensor → ek LSTM
+    forward pass (FORECAST_CHUNK se bade batch chunks mein) → per-series results
+    """
+    buffer  = thread_sequence_buffer(capacity=FORECAST_CHUNK, device=LSTM_DEVICE)
+    model   = models.get("lstm")
+    results = []
+    with torch.no_grad():
+        for i in range(0, len(ndvi_series_list), FORECAST_CHUNK):
+            tensor      = buffer.fill(ndvi_series_list[i:i + FORECAST_CHUNK],
+                                      weathers[i:i + FORECAST_CHUNK])
+            risk_scores = model(tensor).cpu().numpy()
+            results.extend(_forecast_result(row) for row in risk_scores)
+    return results
+
+def predict_forecast(ndvi_series: list, weather: dict) -> dict:
+    """
+    ndvi_series : list of 30 floats (daily NDVI)
+    weather     : {"temp": float, "humidity": float,
+                   "rainfall": float, "day_of_year": int}
+    """
+    return predict_forecast_batch([ndvi_series], [weather])[0]
@@ -0,0 +1,169 @@
+"""
+INT8 post-training quantization for the EfficientNet-B0 CNN.
+
+    python quantize_cnn.py --calib-dir data/calib --eval-dir data/test
+    CNN_PRECISION=int8 uvicorn main:app ...
+
+static  : FX graph mode PTQ — calibration images par activation ranges
+          observe karke convs + linears dono INT8 (default)
+dynamic : sirf Linear layers ke weights INT8, calibration nahi chahiye
+
+Output:
+    models/best_model_int8.pt          frozen TorchScript (predictor load karta hai)
+    models/quantization_report.json    fp32 vs int8: top-1 agreement,
+                                       accuracy (agar eval-dir ImageFolder hai),
+                                       latency, weights size
+"""
+import argparse
+import copy
+import json
+import os
+import time
+from pathlib import Path
+
+os.environ["CNN_PRECISION"] = "fp32"          # reference hamesha fp32 ho
+
+import torch
+import torch.nn as nn
+from torch.ao.quantization import get_default_qconfig_mapping, quantize_dynamic
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+from imaging import BatchBuffer, load_pixels
+from predictor import (CLASS_NAMES, CNN_WEIGHTS, IMG_SIZE, INT8_MODEL_PATH,
+                       MODEL_DIR, QUANT_ENGINE, build_cnn)
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+def list_images(root: Path, limit: int = None) -> list:
+    """(path, label_idx ya None) — ImageFolder layout ho to label folder name se"""
+    class_idx = {name: i for i, name in enumerate(CLASS_NAMES)}
+    items = sorted(
+        (p, class_idx.get(p.parent.name))
+        for p in root.rglob("*") if p.suffix.lower() in IMAGE_EXTS
+    )
+    return items[:limit] if limit else items
+
+def batches(items: list, batch_size: int):
+    buffer = BatchBuffer(capacity=batch_size, size=IMG_SIZE, channels_last=False)
+    for i in range(0, len(items), batch_size):
+        chunk  = items[i:i + batch_size]
+        pixels = [load_pixels(p.read_bytes(), IMG_SIZE) for p, _ in chunk]
+        yield buffer.fill(pixels).clone(), [label for _, label in chunk]
+
+def load_fp32() -> nn.Module:
+    model = build_cnn()
+    model.load_state_dict(
+        torch.load(CNN_WEIGHTS, map_location="cpu", weights_only=True)
+    )
+    return model.eval()
+
+def quantize(model: nn.Module, mode: str, calib: list, batch_size: int) -> nn.Module:
+    if mode == "dynamic":
+        return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+    example  = torch.randn(1, 3, IMG_SIZE, IMG_SIZE)
+    prepared = prepare_fx(model, get_default_qconfig_mapping(QUANT_ENGINE), (example,))
+    with torch.no_grad():
+        for x, _ in batches(calib, batch_size):
+            prepared(x)
+    return convert_fx(prepared)
+
+def latency_ms(model, batch_size: int, repeats: int = 20) -> float:
+    x = torch.randn(batch_size, 3, IMG_SIZE, IMG_SIZE)
+    with torch.no_grad():
+        for _ in range(3):
+            model(x)
+        times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            model(x)
+            times.append((time.perf_counter() - t0) * 1000)
+    return round(sorted(times)[len(times) // 2], 2)
+
+def compare(fp32, int8, items: list, batch_size: int) -> dict:
+    agree = top5_overlap = n = 0
+    correct = {"fp32": 0, "int8": 0}
+    labelled = 0
+    max_prob_diff = 0.0
+    with torch.no_grad():
+        for x, labels in batches(items, batch_size):
+            p32 = torch.softmax(fp32(x), dim=1)
+            p8  = torch.softmax(int8(x), dim=1)
+            t32, t8 = p32.argmax(1), p8.argmax(1)
+            agree         += (t32 == t8).sum().item()
+            top5_overlap  += sum(
+                len(set(a.tolist()) & set(b.tolist()))
+                for a, b in zip(p32.topk(5).indices, p8.topk(5).indices)
+            )
+            max_prob_diff  = max(max_prob_diff, (p32 - p8).abs().max().item())
+            n             += len(labels)
+            for label, a, b in zip(labels, t32.tolist(), t8.tolist()):
+                if label is not None:
+                    labelled        += 1
+                    correct["fp32"] += a == label
+                    correct["int8"] += b == label
+
+    report = {
+        "images"               : n,
+        "top1_agreement_pct"   : round(100 * agree / n, 2),
+        "top5_overlap_pct"     : round(100 * top5_overlap / (5 * n), 2),
+        "max_abs_prob_diff"    : round(max_prob_diff, 4)
+    }
+    if labelled:
+        report["labelled_images"]   = labelled
+        report["fp32_top1_accuracy"] = round(100 * correct["fp32"] / labelled, 2)
+        report["int8_top1_accuracy"] = round(100 * correct["int8"] / labelled, 2)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calib-dir", type=Path, required=True)
+    parser.add_argument("--eval-dir", type=Path, help="default: calib-dir")
+    parser.add_argument("--mode", choices=["static", "dynamic"], default="static")
+    parser.add_argument("--num-calib", type=int, default=256)
+    parser.add_argument("--num-eval", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    torch.backends.quantized.engine = QUANT_ENGINE
+
+    calib = list_images(args.calib_dir, args.num_calib)
+    evals = list_images(args.eval_dir or args.calib_dir, args.num_eval)
+    if not calib or not evals:
+        raise SystemExit("No images found in calib/eval dir")
+
+    fp32 = load_fp32()
+    print(f"Quantizing ({args.mode}, engine={QUANT_ENGINE}) with {len(calib)} calibration images...")
+    int8 = quantize(copy.deepcopy(fp32), args.mode, calib, args.batch_size)
+
+    example  = torch.randn(1, 3, IMG_SIZE, IMG_SIZE)
+    with torch.no_grad():
+        scripted = torch.jit.freeze(torch.jit.trace(int8, example).eval())
+    torch.jit.save(scripted, str(INT8_MODEL_PATH))
+    print(f"✅ Saved {INT8_MODEL_PATH}")
+
+    int8 = torch.jit.load(str(INT8_MODEL_PATH))
+    print(f"Comparing fp32 vs int8 on {len(evals)} images...")
+    report = {
+        "mode"            : args.mode,
+        "engine"          : QUANT_ENGINE,
+        "calib_images"    : len(calib),
+        "threads"         : args.threads,
+        **compare(fp32, int8, evals, args.batch_size),
+        "latency_ms"      : {
+            f"batch_{bs}": {"fp32": latency_ms(fp32, bs), "int8": latency_ms(int8, bs)}
+            for bs in (1, args.batch_size)
+        },
+        "model_size_mb"   : {
+            "fp32": round(CNN_WEIGHTS.stat().st_size / 2**20, 2),
+            "int8": round(INT8_MODEL_PATH.stat().st_size / 2**20, 2)
+        }
+    }
+    with open(MODEL_DIR / "quantization_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
-import requests
+import asyncio
+import io
+import json
 import numpy as np
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
+from token_cache import TokenCache
+from http_client import http, async_http
+from ndvi_cache import NdviTileCache
+from cache import ResultCache
+from singleflight import SingleFlight, AsyncSingleFlight
 
 load_dotenv()
 
@@ -10,83 +17,257 @@ SENTINEL_CLIENT_ID     = os.getenv("SENTINEL_CLIENT_ID")
 SENTINEL_CLIENT_SECRET = os.getenv("SENTINEL_CLIENT_SECRET")
 OPENWEATHER_API_KEY    = os.getenv("OPENWEATHER_API_KEY")
 
-def get_sentinel_token() -> str:
-    """Sentinel Hub access token lo"""
-    response = requests.post(
-        "https://services.sentinel-hub.com/auth/realms/main/protocol/openid-connect/token",
+# Token expiry se itne seconds pehle expired maano / background refresh shuru karo
+SENTINEL_TOKEN_MARGIN  = float(os.getenv("SENTINEL_TOKEN_MARGIN", 60))
+SENTINEL_TOKEN_AHEAD   = float(os.getenv("SENTINEL_TOKEN_AHEAD", 300))
+
+# ── SENTINEL HUB AUTH ─────────────────────────────────────
+def _request_sentinel_token() -> tuple:
+    """OAuth client-credentials round trip → (access_token, expires_in)"""
+    response = http.post(
+        "sentinel_auth", "/auth/realms/main/protocol/openid-connect/token",
         data={
             "grant_type"   : "client_credentials",
             "client_id"    : SENTINEL_CLIENT_ID,
             "client_secret": SENTINEL_CLIENT_SECRET
         }
     )
-    return response.json()["access_token"]
+    response.raise_for_status()
+    data = response.json()
+    return data["access_token"], data.get("expires_in", 3600)
+
+sentinel_token = TokenCache(
+    _request_sentinel_token,
+    refresh_margin = SENTINEL_TOKEN_MARGIN,
+    refresh_ahead  = SENTINEL_TOKEN_AHEAD,
+    name           = "sentinel-token"
+)
+
+def get_sentinel_token() -> str:
+    """Sentinel Hub access token (cached, expiry se pehle background refresh)"""
+    return sentinel_token.get()
+
+async def get_sentinel_token_async() -> str:
+    """Fresh token seedha; warna blocking refresh thread par (event loop free rahe)"""
+    if sentinel_token.fresh:
+        return sentinel_token.get()
+    return await asyncio.to_thread(sentinel_token.get)
+
+# ── NDVI (SENTINEL-2) ─────────────────────────────────────
+NDVI_SIZE       = int(os.getenv("NDVI_SIZE", 64))             # output raster width = height
+NDVI_EDGE_DAYS  = int(os.getenv("NDVI_EDGE_DAYS", 15))        # window se pehle ke din (interp edge)
+NDVI_MAX_CLOUD  = float(os.getenv("NDVI_MAX_CLOUD", 50))      # scene-level cloud filter (%)
+NDVI_MIN_VALID  = float(os.getenv("NDVI_MIN_VALID", 0.3))     # itne se kam clear pixels → date skip
+
+# Multi-temporal NDVI evalscript: har acquisition (orbit) ek FLOAT32 band,
+# cloud / shadow / no-data pixels NaN (SCL se), dates userdata.json mein
+NDVI_EVALSCRIPT = """
+//VERSION=3
+function setup() {
+  return {
+    input: [{ bands: ["B04", "B08", "SCL", "dataMask"] }],
+    output: { id: "default", bands: 1, sampleType: "FLOAT32" },
+    mosaicking: "ORBIT"
+  };
+}
+function sceneList(scenes) {
+  return scenes.orbits || scenes.tiles || scenes;
+}
+function updateOutput(outputs, collection) {
+  Object.values(outputs).forEach(o => { o.bands = sceneList(collection.scenes).length; });
+}
+function updateOutputMetadata(scenes, inputMetadata, outputMetadata) {
+  outputMetadata.userData = { dates: sceneList(scenes).map(s => s.dateFrom || s.date) };
+}
+function evaluatePixel(samples) {
+  // SCL: 3 cloud shadow, 8/9 cloud, 10 cirrus
+  return samples.map(s => (!s.dataMask || [3, 8, 9, 10].includes(s.SCL))
+    ? NaN
+    : (s.B08 - s.B04) / (s.B08 + s.B04 + 0.0001));
+}
+"""
+
+def _ndvi_window(days: int) -> tuple:
+    """(start, end) — interpolation ke liye window se NDVI_EDGE_DAYS pehle se"""
+    end_dt = datetime.now()
+    return end_dt - timedelta(days=days + NDVI_EDGE_DAYS), end_dt
+
+def _ndvi_payload(bbox: list, start_dt: datetime, end_dt: datetime) -> dict:
+    """Process API request body (sync aur async dono isi se)"""
+    return {
+        "input": {
+            "bounds": {
+                "bbox": bbox,
+                "properties": {"crs": "http://www.opengis.net/def/crs/EPSG/0/4326"}
+            },
+            "data": [{
+                "type": "sentinel-2-l2a",
+                "dataFilter": {
+                    "timeRange": {
+                        "from": start_dt.strftime("%Y-%m-%dT00:00:00Z"),
+                        "to"  : end_dt.strftime("%Y-%m-%dT23:59:59Z")
+                    },
+                    "maxCloudCoverage": NDVI_MAX_CLOUD
+                }
+            }]
+        },
+        "output": {
+            "width": NDVI_SIZE, "height": NDVI_SIZE,
+            "responses": [
+                {"identifier": "default",  "format": {"type": "image/tiff"}},
+                {"identifier": "userdata", "format": {"type": "application/json"}}
+            ]
+        },
+        "evalscript": NDVI_EVALSCRIPT
+    }
+
+# Multi-response → tar (default.tif + userdata.json)
+NDVI_HEADERS = {"Accept": "application/tar"}
+
+# Per-acquisition rasters ka disk cache (NDVI_CACHE_DIR unset → off)
+ndvi_tiles   = NdviTileCache()
+
+def _read_ndvi_response(status_code: int, content: bytes) -> tuple:
+    """Process API tar response → (acquisition dates, float32 [N, H, W] NDVI stack)"""
+    import tarfile
+    import tifffile
+
+    if status_code == 401:
+        sentinel_token.invalidate()             # revoke / clock skew → agli baar naya token
+    if status_code != 200:
+        raise RuntimeError(f"Process API returned {status_code}")
+
+    with tarfile.open(fileobj=io.BytesIO(content)) as tar:
+        dates = json.load(tar.extractfile("userdata.json"))["dates"]
+        if not dates:                            # range mein koi acquisition nahi (0 bands)
+            return [], np.empty((0, NDVI_SIZE, NDVI_SIZE), dtype=np.float32)
+        stack = tifffile.imread(io.BytesIO(tar.extractfile("default.tif").read()))
+
+    # Process API multi-band TIFF band-interleaved [H, W, N] deta hai — wahi
+    # pehle check (N == NDVI_SIZE ho to shape[0] bhi N hota hai, rows nahi!)
+    stack = np.asarray(stack, dtype=np.float32)
+    if stack.ndim == 2 and len(dates) == 1:
+        stack = stack[None]
+    elif stack.ndim == 3 and stack.shape[-1] == len(dates):
+        stack = np.moveaxis(stack, -1, 0)
+    elif stack.ndim != 3 or stack.shape[0] != len(dates):
+        raise ValueError(f"NDVI stack {stack.shape} does not match {len(dates)} dates")
+    dates = [datetime.fromisoformat(d.replace("Z", "+00:00")).date() for d in dates]
+    return dates, stack
+
+def _resample_ndvi(acquisitions, end_date, days: int):
+    """
+    [(date, [H, W] NDVI band), ...] → per-acquisition clear-pixel mean
+    (NDVI_MIN_VALID se zyada clear pixels wale hi) → `days` din ka daily grid
+    (end_date tak), linear interpolation. Window ke bahar ke din nearest
+    observation hold karte hain. Koi clear date nahi → None.
+    """
+    obs = {}
+    for date, band in acquisitions:
+        if np.count_nonzero(~np.isnan(band)) >= NDVI_MIN_VALID * band.size:
+            obs.setdefault(date, []).append(float(np.nanmean(band)))
+    if not obs:
+        return None
+
+    obs_days = sorted(obs)
+    x        = np.array([(d - end_date).days for d in obs_days], dtype=np.float64)
+    y        = np.array([np.mean(obs[d]) for d in obs_days])
+    grid     = np.arange(-(days - 1), 1, dtype=np.float64)
+    return np.round(np.interp(grid, x, y), 3).tolist()
+
+def _plan_ndvi(bbox: list, days: int) -> tuple:
+    """
+    → (cache key, start, end, fetch_from). fetch_from None = poora window
+    NDVI tile cache se, network nahi. Cache off ho to key None, poora window fetch.
+    """
+    start_dt, end_dt = _ndvi_window(days)
+    if not ndvi_tiles.enabled:
+        return None, start_dt, end_dt, start_dt
+    key  = ndvi_tiles.scene_key(bbox, NDVI_SIZE, NDVI_EVALSCRIPT, NDVI_MAX_CLOUD)
+    plan = ndvi_tiles.plan(key, start_dt.date(), end_dt.date())
+    return key, start_dt, end_dt, datetime.combine(plan[0], datetime.min.time()) if plan else None
+
+def _finish_ndvi(key, start_dt: datetime, end_dt: datetime, days: int,
+                 fetch_from, response, error: Exception = None) -> list:
+    """
+    Fetched response (agar hai) cache mein + window ke rasters → daily series.
+    Fetch / parse fail ho (error) to jo rasters cache mein hain (stale sahi)
+    unhi se series; synthetic fallback sirf tab jab kuch usable na ho.
+    """
+    fetched = None
+    if error is None and response is not None:
+        try:
+            fetched = _read_ndvi_response(response.status_code, response.content)
+        except Exception as e:
+            error = e
+    if error is not None:
+        print(f"Sentinel API error: {error}")
+
+    if key is None:
+        acquisitions = zip(*fetched) if fetched else []
+    else:
+        if fetched is not None:
+            ndvi_tiles.store(key, (fetch_from.date(), end_dt.date()), *fetched)
+        elif error is not None:
+            ndvi_tiles.defer(key)                # har call par dobara fail nahi
+        acquisitions = [(d, band)
+                        for d, bands in ndvi_tiles.load(key, start_dt.date(), end_dt.date())
+                        for band in bands]
+
+    series = _resample_ndvi(acquisitions, end_dt.date(), days)
+    if series is None:
+        print("Sentinel: no clear acquisition in window — fallback NDVI")
+        return _fallback_ndvi()
+    return series
 
 def fetch_ndvi(bbox: list, days: int = 30) -> list:
     """
     bbox = [lon_min, lat_min, lon_max, lat_max]
-    Returns: list of 30 NDVI floats
+    Returns: list of `days` daily NDVI floats (oldest → today)
+
+    Ek hi Process API request window ki saari Sentinel-2 acquisitions
+    laata hai (har date ek band); per-date clear-pixel mean ko daily grid
+    par interpolate karta hai. NDVI_CACHE_DIR set ho to rasters disk par
+    cache hote hain aur sirf naya hissa fetch hota hai.
     """
     try:
-        token   = get_sentinel_token()
-        end_dt  = datetime.now()
-        start_dt= end_dt - timedelta(days=days * 5)   # 5-day revisit
-
-        # NDVI evalscript
-        evalscript = """
-        //VERSION=3
-        function setup() {
-          return { input: ["B04", "B08"], output: { bands: 1 } };
-        }
-        function evaluatePixel(s) {
-          let ndvi = (s.B08 - s.B04) / (s.B08 + s.B04 + 0.0001);
-          return [ndvi];
-        }
-        """
-
-        payload = {
-            "input": {
-                "bounds": {
-                    "bbox": bbox,
-                    "properties": {"crs": "http://www.opengis.net/def/crs/EPSG/0/4326"}
-                },
-                "data": [{
-                    "type": "sentinel-2-l2a",
-                    "dataFilter": {
-                        "timeRange": {
-                            "from": start_dt.strftime("%Y-%m-%dT00:00:00Z"),
-                            "to"  : end_dt.strftime("%Y-%m-%dT23:59:59Z")
-                        },
-                        "maxCloudCoverage": 20
-                    }
-                }]
-            },
-            "output": {
-                "width": 64, "height": 64,
-                "responses": [{"identifier": "default",
-                               "format": {"type": "image/tiff"}}]
-            },
-            "evalscript": evalscript
-        }
-
-        response = requests.post(
-            "https://services.sentinel-hub.com/api/v1/process",
-            json=payload,
-            headers={"Authorization": f"Bearer {token}"}
-        )
-
-        if response.status_code == 200:
-            # TIFF parse karke NDVI mean nikalo
-            import io
-            from PIL import Image as PILImage
-            img  = PILImage.open(io.BytesIO(response.content))
-            arr  = np.array(img, dtype=np.float32)
-            ndvi = float(np.nanmean(arr))
-            # 30 days simulate (same value with noise for now)
-            return [round(ndvi + np.random.normal(0, 0.02), 3) for _ in range(30)]
-        else:
-            return _fallback_ndvi()
+        key, start_dt, end_dt, fetch_from = _plan_ndvi(bbox, days)
+        response, error = None, None
+        if fetch_from is not None:
+            try:
+                token    = get_sentinel_token()
+                response = http.post(
+                    "sentinel_process", "/api/v1/process",
+                    json=_ndvi_payload(bbox, fetch_from, end_dt),
+                    headers={"Authorization": f"Bearer {token}", **NDVI_HEADERS}
+                )
+            except Exception as e:
+                error = e
+        return _finish_ndvi(key, start_dt, end_dt, days, fetch_from, response, error)
+    except Exception as e:
+        print(f"Sentinel API error: {e}")
+        return _fallback_ndvi()
 
+async def fetch_ndvi_async(bbox: list, days: int = 30) -> list:
+    """
+    fetch_ndvi ka async version (httpx) — event loop block nahi hota: tile
+    cache ka disk I/O aur tar / TIFF decode asyncio.to_thread mein
+    """
+    try:
+        key, start_dt, end_dt, fetch_from = await asyncio.to_thread(_plan_ndvi, bbox, days)
+        response, error = None, None
+        if fetch_from is not None:
+            try:
+                token    = await get_sentinel_token_async()
+                response = await async_http.post(
+                    "sentinel_process", "/api/v1/process",
+                    json=_ndvi_payload(bbox, fetch_from, end_dt),
+                    headers={"Authorization": f"Bearer {token}", **NDVI_HEADERS}
+                )
+            except Exception as e:
+                error = e
+        return await asyncio.to_thread(_finish_ndvi, key, start_dt, end_dt, days,
+                                       fetch_from, response, error)
     except Exception as e:
         print(f"Sentinel API error: {e}")
         return _fallback_ndvi()
@@ -118,27 +299,107 @@ def _fallback_ndvi() -> list:
     return series
 
 
+# ── WEATHER (OPENWEATHERMAP) ──────────────────────────────
+# District ke saare fields ka weather lagbhag same hai, aur OWM key rate-limited
+# hai — isliye weather grid cell (WEATHER_GRID_DEG ≈ 11 km) ke hisaab se cache:
+#   age < WEATHER_CACHE_TTL                  → fresh, seedha
+#   age < WEATHER_CACHE_TTL + WEATHER_STALE_TTL → stale, seedha + background refresh
+#   warna                                      → upstream call (same cell ke
+#                                                concurrent misses → ek call)
+WEATHER_GRID_DEG   = float(os.getenv("WEATHER_GRID_DEG", 0.1))
+WEATHER_CACHE_TTL  = float(os.getenv("WEATHER_CACHE_TTL", 10 * 60))
+WEATHER_STALE_TTL  = float(os.getenv("WEATHER_STALE_TTL", 30 * 60))
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", 4096))
+
+weather_cache        = ResultCache(max_entries=WEATHER_CACHE_SIZE,
+                                   ttl_seconds=WEATHER_CACHE_TTL + WEATHER_STALE_TTL)
+weather_flight       = SingleFlight("weather")
+weather_flight_async = AsyncSingleFlight("weather")
+
+def weather_cell(lat: float, lon: float) -> str:
+    """(lat, lon) → grid cell key, e.g. "200:738" (0.1° cells)"""
+    return f"{round(lat / WEATHER_GRID_DEG)}:{round(lon / WEATHER_GRID_DEG)}"
+
+def _cell_center(cell: str) -> tuple:
+    i, j = (int(v) for v in cell.split(":"))
+    return round(i * WEATHER_GRID_DEG, 6), round(j * WEATHER_GRID_DEG, 6)
+
+def _weather_params(lat: float, lon: float) -> dict:
+    return {"lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY, "units": "metric"}
+
+def _parse_weather(data: dict) -> dict:
+    return {
+        "temp"        : data["main"]["temp"],
+        "humidity"    : data["main"]["humidity"],
+        "rainfall"    : data.get("rain", {}).get("1h", 0),
+        "description" : data["weather"][0]["description"]
+    }
+
+def _today(weather: dict) -> dict:
+    """Cached weather + aaj ka day_of_year (cache midnight cross kare to bhi sahi)"""
+    return {**weather, "day_of_year": datetime.now().timetuple().tm_yday}
+
+def _fallback_weather() -> dict:
+    return {
+        "temp": 28, "humidity": 65,
+        "rainfall": 0, "description": "N/A",
+        "day_of_year": datetime.now().timetuple().tm_yday
+    }
+
+def _refresh_weather(cell: str) -> dict:
+    r = http.get("openweather", "/data/2.5/weather", params=_weather_params(*_cell_center(cell)))
+    r.raise_for_status()
+    weather = _parse_weather(r.json())
+    weather_cache.set(cell, weather)                 # fallback kabhi cache nahi hota
+    return weather
+
+async def _refresh_weather_async(cell: str) -> dict:
+    r = await async_http.get("openweather", "/data/2.5/weather",
+                             params=_weather_params(*_cell_center(cell)))
+    r.raise_for_status()
+    weather = _parse_weather(r.json())
+    weather_cache.set(cell, weather)
+    return weather
+
 def fetch_weather(lat: float, lon: float) -> dict:
-    """OpenWeatherMap se current weather lo"""
+    """OpenWeatherMap se current weather lo (grid-cell cache ke through)"""
     try:
-        url = (
-            f"https://api.openweathermap.org/data/2.5/weather"
-            f"?lat={lat}&lon={lon}"
-            f"&appid={OPENWEATHER_API_KEY}&units=metric"
-        )
-        r    = requests.get(url, timeout=5)
-        data = r.json()
-        return {
-            "temp"        : data["main"]["temp"],
-            "humidity"    : data["main"]["humidity"],
-            "rainfall"    : data.get("rain", {}).get("1h", 0),
-            "description" : data["weather"][0]["description"],
-            "day_of_year" : datetime.now().timetuple().tm_yday
-        }
+        cell           = weather_cell(lat, lon)
+        weather, age   = weather_cache.get_with_age(cell)
+        if weather is None:
+            weather = weather_flight.do(cell, lambda: _refresh_weather(cell))
+        elif age > WEATHER_CACHE_TTL:
+            weather_flight.do_in_background(cell, lambda: _refresh_weather(cell))
+        return _today(weather)
     except Exception as e:
         print(f"Weather API error: {e}")
-        return {
-            "temp": 28, "humidity": 65,
-            "rainfall": 0, "description": "N/A",
-            "day_of_year": datetime.now().timetuple().tm_yday
-        }
+        return _fallback_weather()
+
+async def fetch_weather_async(lat: float, lon: float) -> dict:
+    """fetch_weather ka async version (httpx, event-loop single-flight)"""
+    try:
+        cell           = weather_cell(lat, lon)
+        weather, age   = weather_cache.get_with_age(cell)
+        if weather is None:
+            weather = await weather_flight_async.do(cell, lambda: _refresh_weather_async(cell))
+        elif age > WEATHER_CACHE_TTL:
+            weather_flight_async.do_in_background(cell, lambda: _refresh_weather_async(cell))
+        return _today(weather)
+    except Exception as e:
+        print(f"Weather API error: {e}")
+        return _fallback_weather()
+
+def weather_stats() -> dict:
+    stats = weather_cache.stats()
+    return {
+        "cell_deg"     : WEATHER_GRID_DEG,
+        "fresh_ttl_s"  : WEATHER_CACHE_TTL,
+        "stale_ttl_s"  : WEATHER_STALE_TTL,
+        "size"         : stats["size"],
+        "max_entries"  : stats["max_entries"],
+        "hits"         : stats["hits"],
+        "misses"       : stats["misses"],
+        "hit_rate"     : stats["hit_rate"],
+        "single_flight": {"sync" : weather_flight.stats(),
+                          "async": weather_flight_async.stats()}
+    }
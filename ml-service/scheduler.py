@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl                                  # POSIX; Windows dev par har process leader
+except ImportError:
+    fcntl = None
+
+# ── CONFIG ────────────────────────────────────────────────
+DISTRICT_SCHEDULER           = os.getenv("DISTRICT_SCHEDULER", "1") == "1"
+DISTRICT_REFRESH_MINUTES     = float(os.getenv("DISTRICT_REFRESH_MINUTES", 60))
+DISTRICT_REFRESH_CONCURRENCY = int(os.getenv("DISTRICT_REFRESH_CONCURRENCY", 4))
+DISTRICT_STALE_MINUTES       = float(os.getenv("DISTRICT_STALE_MINUTES", 2 * DISTRICT_REFRESH_MINUTES))
+# Multi-worker (WEB_CONCURRENCY > 1) par sirf ek worker (lock holder) refresh
+# karta hai; baaki usi ki risk file se padhte hain — isliye file default on
+_TMP                         = Path(tempfile.gettempdir())
+DISTRICT_RISK_FILE           = os.getenv("DISTRICT_RISK_FILE") or (
+    str(_TMP / "krishisat-district-risk.json") if int(os.getenv("WEB_CONCURRENCY", 1)) > 1 else None
+)                                                                  # unset (1 worker) → sirf memory
+DISTRICT_LOCK_FILE           = os.getenv("DISTRICT_LOCK_FILE", str(_TMP / "krishisat-district-scheduler.lock"))
+DISTRICT_RELOAD_SECONDS      = float(os.getenv("DISTRICT_RELOAD_SECONDS", 30))
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+# ── DISTRICT RISK SCHEDULER ───────────────────────────────
+class DistrictScheduler:
+    """
+    Har registered district ka full pipeline (NDVI + weather + LSTM) har
+    interval par background mein chalata hai, result memory (+ optional
+    JSON file) mein rakhta hai — dashboard read get() se O(1) dict lookup.
+
+    run     : async (district dict) → pipeline result
+    Refresh round mein max `concurrency` districts saath chalte hain; ek
+    district fail ho to uska pichla result rehta hai (last_error ke saath).
+    store_path set ho to har round ke baad likha jaata hai aur startup par
+    padha jaata hai, taaki restart ke baad bhi turant (stale flag ke saath)
+    result mile.
+
+    Har uvicorn worker apna scheduler start karta hai, lekin refresh sirf
+    woh karta hai jisne lock_path par flock liya (leader) — N workers par
+    N× Sentinel / OWM calls nahi. Baaki workers har reload_s par lock try
+    karte hain (leader mar gaya to koi aur le leta hai) aur tab tak
+    store_path badla ho to dobara padhte hain.
+    """
+    def __init__(self, run, districts: list,
+                 interval_s: float = DISTRICT_REFRESH_MINUTES * 60,
+                 concurrency: int = DISTRICT_REFRESH_CONCURRENCY,
+                 stale_after_s: float = DISTRICT_STALE_MINUTES * 60,
+                 store_path: str = DISTRICT_RISK_FILE, lock_path: str = DISTRICT_LOCK_FILE,
+                 reload_s: float = DISTRICT_RELOAD_SECONDS, name: str = "district-scheduler"):
+        self.run           = run
+        self.districts     = {d["id"]: d for d in districts}
+        self.interval      = interval_s
+        self.concurrency   = max(1, int(concurrency))
+        self.stale_after   = stale_after_s
+        self.store_path    = Path(store_path) if store_path else None
+        self.lock_path     = Path(lock_path)
+        self.reload_s      = reload_s
+        self.name          = name
+        self._results      = {}             # district id → entry
+        self._task         = None
+        self._lock_file    = None           # leader hai to open flock'd file
+        self._loaded_mtime = None
+        self._round        = {"rounds": 0, "last_started": None,
+                              "last_finished": None, "last_duration_s": None}
+        self._counters     = {"refreshes": 0, "failures": 0}
+        self._load()
+
+    # ── LIFECYCLE ──
+    def start(self):
+        """Event loop ke andar (lifespan) call karein"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_file is not None:
+            self._lock_file.close()                  # flock release
+            self._lock_file = None
+
+    @property
+    def leader(self) -> bool:
+        return self._lock_file is not None
+
+    def _try_lead(self) -> bool:
+        lock_file = open(self.lock_path, "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:                          # dusre worker ke paas hai
+                lock_file.close()
+                return False
+        self._lock_file = lock_file
+        return True
+
+    async def _loop(self):
+        while not self._try_lead():
+            self._reload()                           # leader ka result file se
+            await asyncio.sleep(self.reload_s)
+        print(f"✅ {self.name}: leader (pid {os.getpid()})")
+        while True:
+            try:
+                await self.refresh_all()
+            except Exception as e:
+                print(f"❌ {self.name} round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ── REFRESH ──
+    async def refresh_all(self):
+        started = time.time()
+        self._round["last_started"] = started
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(district):
+            async with semaphore:
+                await self._refresh(district)
+
+        await asyncio.gather(*(one(d) for d in self.districts.values()))
+        self._round["rounds"]         += 1
+        self._round["last_finished"]   = time.time()
+        self._round["last_duration_s"] = round(time.time() - started, 2)
+        if self.store_path:
+            await asyncio.to_thread(self._save)
+        print(f"✅ {self.name}: {len(self.districts)} districts refreshed in "
+              f"{self._round['last_duration_s']} s")
+
+    async def _refresh(self, district: dict):
+        entry = self._results.setdefault(district["id"], {"result": None, "computed_at": None,
+                                                          "duration_ms": None, "last_error": None})
+        t0 = time.perf_counter()
+        try:
+            result = await self.run(district)
+        except Exception as e:
+            self._counters["failures"] += 1
+            entry["last_error"] = f"{type(e).__name__}: {e}"
+            print(f"⚠️ {self.name}: district {district['id']} failed: {e}")
+            return
+        self._counters["refreshes"] += 1
+        entry.update(result=result, computed_at=time.time(), last_error=None,
+                     duration_ms=round((time.perf_counter() - t0) * 1000, 1))
+
+    # ── READ ──
+    def get(self, district_id: int):
+        """Precomputed risk + staleness metadata; unknown district → None"""
+        district = self.districts.get(district_id)
+        if district is None:
+            return None
+        entry = self._results.get(district_id) or {"result": None, "computed_at": None,
+                                                   "duration_ms": None, "last_error": None}
+        computed = entry["computed_at"]
+        age      = time.time() - computed if computed else None
+        return {
+            "district"   : district,
+            "ready"      : entry["result"] is not None,
+            "computed_at": _iso(computed) if computed else None,
+            "age_s"      : round(age, 1) if age is not None else None,
+            "stale"      : age is None or age > self.stale_after,
+            "last_error" : entry["last_error"],
+            "data"       : entry["result"]
+        }
+
+    def all(self) -> list:
+        return [self.get(district_id) for district_id in self.districts]
+
+    # ── PERSISTENCE ──
+    def _save(self):
+        tmp = self.store_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({str(k): v for k, v in self._results.items()}, f)
+        os.replace(tmp, self.store_path)             # atomic
+
+    def _load(self, quiet: bool = False):
+        if not self.store_path or not self.store_path.exists():
+            return
+        try:
+            mtime = self.store_path.stat().st_mtime
+            with open(self.store_path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {self.name}: could not read {self.store_path}: {e}")
+            return
+        self._results      = {int(k): v for k, v in stored.items() if int(k) in self.districts}
+        self._loaded_mtime = mtime
+        if not quiet:
+            print(f"✅ {self.name}: {len(self._results)} districts loaded from {self.store_path}")
+
+    def _reload(self):
+        """Follower: leader ne file badli ho to dobara padho"""
+        try:
+            changed = self.store_path and self.store_path.stat().st_mtime != self._loaded_mtime
+        except OSError:
+            return
+        if changed:
+            self._load(quiet=True)
+
+    # ── STATS ──
+    def stats(self) -> dict:
+        entries = self.all()
+        return {
+            "enabled"          : self._task is not None,
+            "leader"           : self.leader,
+            "districts"        : len(self.districts),
+            "ready"            : sum(e["ready"] for e in entries),
+            "stale"            : sum(e["stale"] for e in entries),
+            "interval_s"       : self.interval,
+            "stale_after_s"    : self.stale_after,
+            "concurrency"      : self.concurrency,
+            "store"            : str(self.store_path) if self.store_path else None,
+            **self._counters,
+            "rounds"           : self._round["rounds"],
+            "last_started"     : _iso(self._round["last_started"]) if self._round["last_started"] else None,
+            "last_finished"    : _iso(self._round["last_finished"]) if self._round["last_finished"] else None,
+            "last_duration_s"  : self._round["last_duration_s"]
+        }
@@ -0,0 +1,85 @@
+import datetime
+import threading
+from itertools import chain, islice
+
+import numpy as np
+import torch
+
+SEQ_LEN      = 30           # LSTM input: last 30 days
+NUM_FEATURES = 5            # ndvi, temp, humidity, rainfall, day-of-year
+
+# Weather feature = (value - offset) / scale, missing key → default
+WEATHER_FEATURES = (
+    # key         default  offset  scale
+    ("temp"     , 28     , 15    , 25 ),
+    ("humidity" , 0.6    , 0     , 100),
+    ("rainfall" , 0      , 0     , 50 ),
+)
+
+# ── VECTORIZED FEATURE BUILDER ────────────────────────────
+class SequenceBuffer:
+    """
+    Preallocated float32 [capacity, 30, 5] LSTM input.
+
+    fill() many (ndvi_series, weather) pairs ko ek saath features mein
+    badalta hai — per-row Python loop ya insert(0, ...) padding nahi:
+        ndvi     : har series ke last 30 values; kam hon to pehli value se
+                   aage pad (row 0 hi repeat, uska day encoding bhi)
+        weather  : har series ke liye ek baar padh kar 30 rows par broadcast
+        day      : ((day_of_year + k) % 365) / 365, k = source row index
+    Sab arithmetic float64 mein, buffer mein float32 cast — purane list
+    builder + torch.FloatTensor jaisa hi output. Capacity se bada batch aaye
+    to buffer ek baar grow hota hai.
+    """
+    def __init__(self, capacity: int = 64, device: torch.device = torch.device("cpu")):
+        self.device = device
+        self._steps = np.arange(SEQ_LEN)
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.buffer   = torch.empty((capacity, SEQ_LEN, NUM_FEATURES), dtype=torch.float32)
+        self.array    = self.buffer.numpy()                 # same memory, numpy view
+
+    def fill(self, ndvi_series_list: list, weathers: list) -> torch.Tensor:
+        """[(ndvi_series, weather), ...] → [n, 30, 5] view of the buffer"""
+        n = len(ndvi_series_list)
+        if n > self.capacity:
+            self._allocate(n)
+        out = self.array[:n]
+
+        # NDVI: sab series ke last-30 values ek flat array mein, phir gather
+        lengths = np.fromiter((min(len(s), SEQ_LEN) for s in ndvi_series_list),
+                              dtype=np.int64, count=n)
+        if n and lengths.min() == 0:
+            raise ValueError("ndvi_series must not be empty")
+        flat    = np.fromiter(
+            chain.from_iterable(islice(s, len(s) - m, None)
+                                for s, m in zip(ndvi_series_list, lengths)),
+            dtype=np.float64, count=int(lengths.sum())
+        )
+        starts  = np.cumsum(lengths) - lengths
+        src     = np.maximum(self._steps - (SEQ_LEN - lengths)[:, None], 0)   # [n, 30]
+        out[:, :, 0] = flat[starts[:, None] + src]
+
+        # Weather: har dict ek baar, column broadcast
+        for col, (key, default, offset, scale) in enumerate(WEATHER_FEATURES, start=1):
+            values = np.fromiter((float(w.get(key, default)) for w in weathers),
+                                 dtype=np.float64, count=n)
+            out[:, :, col] = ((values - offset) / scale)[:, None]
+
+        today = datetime.datetime.now().timetuple().tm_yday
+        doy   = np.array([w.get("day_of_year", today) for w in weathers], dtype=np.float64)
+        out[:, :, 4] = np.mod(doy[:, None] + src, 365) / 365
+
+        batch = self.buffer[:n]
+        return batch if self.device.type == "cpu" else batch.to(self.device)
+
+_local = threading.local()
+
+def thread_sequence_buffer(**kwargs) -> SequenceBuffer:
+    """Har thread ka apna SequenceBuffer (inference pool threads)"""
+    buf = getattr(_local, "buffer", None)
+    if buf is None:
+        buf = _local.buffer = SequenceBuffer(**kwargs)
+    return buf
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+# ── SINGLE-FLIGHT (THREADS) ───────────────────────────────
+class SingleFlight:
+    """
+    Same key ke concurrent calls → ek hi execution, baaki callers usi ka
+    result (ya exception) paate hain. Call khatam hote hi key free — agla
+    call naya execution hai (ye cache nahi hai).
+    """
+    def __init__(self, name: str = "singleflight"):
+        self.name      = name
+        self._calls    = {}                  # key → Future
+        self._lock     = threading.Lock()
+        self._counters = {"executions": 0, "coalesced": 0, "background": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self._counters["executions"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        self._finish(key)
+        future.set_result(result)
+        return result
+
+    def do_in_background(self, key, fn):
+        """Key pehle se in-flight nahi hai to fn() daemon thread mein (result ignore)"""
+        with self._lock:
+            if key in self._calls:
+                return
+            self._counters["background"] += 1
+        threading.Thread(target=self._background, args=(key, fn),
+                         name=f"{self.name}-refresh", daemon=True).start()
+
+    def _background(self, key, fn):
+        try:
+            self.do(key, fn)
+        except Exception as e:
+            print(f"⚠️ {self.name} background call failed: {e}")
+
+    def _finish(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._calls)}
+
+# ── SINGLE-FLIGHT (ASYNCIO) ───────────────────────────────
+class AsyncSingleFlight:
+    """
+    SingleFlight ka event-loop version. Shared kaam ek alag Task mein
+    chalta hai aur har caller shield() karke await karta hai — ek caller
+    (client disconnect) cancel ho to baaki waiters ka kaam nahi rukta.
+    """
+    def __init__(self, name: str = "singleflight"):
+        self.name      = name
+        self._calls    = {}                  # key → Task
+        self._counters = {"executions": 0, "coalesced": 0, "background": 0}
+
+    def _task(self, key, fn) -> asyncio.Task:
+        task = self._calls.get(key)
+        if task is not None:
+            self._counters["coalesced"] += 1
+            return task
+        self._counters["executions"] += 1
+        task = self._calls[key] = asyncio.ensure_future(fn())
+
+        def done(t):
+            if self._calls.get(key) is t:
+                del self._calls[key]
+            if not t.cancelled():
+                t.exception()                # "exception never retrieved" warning nahi
+        task.add_done_callback(done)
+        return task
+
+    async def do(self, key, fn):
+        """fn: () → awaitable"""
+        return await asyncio.shield(self._task(key, fn))
+
+    def do_in_background(self, key, fn):
+        """Key in-flight nahi hai to fn() Task mein start (await nahi)"""
+        if key in self._calls:
+            return
+        self._counters["background"] += 1
+        task = self._task(key, fn)
+
+        def log(t):
+            if not t.cancelled() and t.exception() is not None:
+                print(f"⚠️ {self.name} background call failed: {t.exception()}")
+        task.add_done_callback(log)
+
+    def stats(self) -> dict:
+        return {**self._counters, "in_flight": len(self._calls)}
@@ -0,0 +1,56 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+# ── BATCH ENTRY STREAMS ───────────────────────────────────
+# Batch endpoints per-item entries ({"index", "success", data|error, ...})
+# ek async iterator se dete hain, jaise-jaise bante hain. Wahi iterator:
+#   collect()         → purana buffered JSON {"success","count","failed","data"}
+#   ndjson_response() → application/x-ndjson, har entry ek line, turant flush
+
+async def in_input_order(entries):
+    """Completion order entries → index order (aage wale pending tak buffer)"""
+    waiting, next_index = {}, 0
+    async for entry in entries:
+        waiting[entry["index"]] = entry
+        while next_index in waiting:
+            yield waiting.pop(next_index)
+            next_index += 1
+
+async def collect(entries) -> dict:
+    results = sorted([entry async for entry in entries], key=lambda e: e["index"])
+    return {
+        "success": True,
+        "count"  : len(results),
+        "failed" : sum(1 for r in results if not r["success"]),
+        "data"   : results
+    }
+
+def _line(obj) -> str:
+    return json.dumps(jsonable_encoder(obj), separators=(",", ":")) + "\n"
+
+def ndjson_response(entries, order: str = "input") -> StreamingResponse:
+    """
+    Har entry ek JSON line. Aakhri line summary hai (koi "index" nahi):
+        {"success": true, "count": n, "failed": k}
+    Headers bhejne ke baad status code nahi badal sakta — beech mein poora
+    batch fail ho (e.g. inference queue full) to summary
+    {"success": false, "error": ...} ke saath stream band hota hai.
+    """
+    async def body():
+        count = failed = 0
+        stream = in_input_order(entries) if order == "input" else entries
+        try:
+            async for entry in stream:
+                count  += 1
+                failed += not entry["success"]
+                yield _line(entry)
+        except Exception as e:
+            yield _line({"success": False, "count": count, "failed": failed,
+                         "error": f"{type(e).__name__}: {e}"})
+            return
+        yield _line({"success": True, "count": count, "failed": failed})
+
+    return StreamingResponse(body(), media_type="application/x-ndjson",
+                             headers={"X-Accel-Buffering": "no"})   # proxy buffering off
@@ -0,0 +1,120 @@
+import threading
+import time
+from metrics import RollingStats
+
+# ── ACCESS TOKEN CACHE ────────────────────────────────────
+class TokenCache:
+    """
+    OAuth access token ko expires_in tak reuse karta hai.
+
+    fetch : () → (token, expires_in_seconds)
+    Teen zones (token ki lifetime ke hisaab se):
+        fresh        → cached token seedha
+        refresh_ahead seconds se kam bache → cached token + background refresh
+        refresh_margin seconds se kam bache → expired maano, caller refresh
+                                               ka wait karta hai
+    Ek waqt par sirf ek fetch chalta hai (single-flight) — concurrent callers
+    usi fetch ka result use karte hain. Background refresh fail ho to purana
+    token expiry tak chalta rehta hai.
+    """
+    def __init__(self, fetch, refresh_margin: float = 60,
+                 refresh_ahead: float = 300, name: str = "token"):
+        self.fetch          = fetch
+        self.refresh_margin = refresh_margin
+        self.refresh_ahead  = refresh_ahead
+        self.name           = name
+        self._token         = None
+        self._expires_at    = 0.0          # hard expiry (margin ke saath)
+        self._refresh_at    = 0.0          # is ke baad background refresh
+        self._fetch_lock    = threading.Lock()
+        self._lock          = threading.Lock()
+        self._refreshing    = False
+        self._fetch_ms      = RollingStats()
+        self._counters      = {"hits": 0, "fetches": 0, "blocking_refreshes": 0,
+                               "background_refreshes": 0, "failures": 0}
+
+    def get(self) -> str:
+        now = time.monotonic()
+        if self._token is not None and now < self._expires_at:
+            self._count("hits")
+            if now >= self._refresh_at:
+                self._refresh_in_background()
+            return self._token
+        return self._refresh_blocking()
+
+    @property
+    def fresh(self) -> bool:
+        """get() bina fetch ke turant lautega?"""
+        return self._token is not None and time.monotonic() < self._expires_at
+
+    def invalidate(self):
+        """401 mila to token dobara lo (agle get() par)"""
+        self._expires_at = 0.0
+
+    # ── REFRESH ──
+    def _refresh_blocking(self) -> str:
+        with self._fetch_lock:
+            if self._token is not None and time.monotonic() < self._expires_at:
+                self._count("hits")                 # dusre caller ne abhi refresh kiya
+                return self._token
+            self._count("blocking_refreshes")
+            self._fetch()
+            return self._token
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_loop,
+                         name=f"{self.name}-refresh", daemon=True).start()
+
+    def _background_loop(self):
+        try:
+            with self._fetch_lock:
+                if time.monotonic() < self._refresh_at:
+                    return                          # blocking caller ne kar diya
+                self._count("background_refreshes")
+                self._fetch()
+        except Exception as e:
+            print(f"⚠️ {self.name} background refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _fetch(self):
+        """_fetch_lock ke andar hi call hota hai"""
+        t0 = time.perf_counter()
+        try:
+            token, expires_in = self.fetch()
+        except Exception:
+            self._count("failures")
+            raise
+        finally:
+            self._fetch_ms.observe((time.perf_counter() - t0) * 1000)
+        self._count("fetches")
+
+        now        = time.monotonic()
+        expires_in = float(expires_in)
+        # Chhoti lifetime par bhi margin/ahead lifetime ka hissa hi rahe
+        margin     = min(self.refresh_margin, expires_in * 0.1)
+        ahead      = min(self.refresh_ahead, expires_in * 0.25)
+        self._token, self._expires_at, self._refresh_at = (
+            token, now + expires_in - margin, now + expires_in - margin - ahead
+        )
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    # ── STATS ──
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        remaining = self._expires_at - time.monotonic() if self._token else None
+        return {
+            "cached"        : self._token is not None and remaining > 0,
+            "expires_in_s"  : round(max(remaining, 0), 1) if remaining is not None else None,
+            **counters,
+            "fetch_ms"      : self._fetch_ms.summary()
+        }